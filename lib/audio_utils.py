@@ -7,22 +7,11 @@ import streamlit as st
 from typing import Optional
 
 
-def get_tts_component(text: str, button_label: str = "🔊 Listen") -> str:
-    """
-    Create a text-to-speech button using Web Speech API.
-
-    Args:
-        text: The text to be read aloud
-        button_label: Label for the button
-
-    Returns:
-        HTML string with the TTS button component
-    """
-    # Escape quotes and newlines for JavaScript
-    safe_text = text.replace("'", "\\'").replace('"', '\\"').replace('\n', ' ')
-    button_id = f"tts_btn_{id(text)}"
+# Characters that must be escaped before embedding text in a JS string literal
+_JS_ESCAPES = str.maketrans({"'": "\\'", '"': '\\"', '\n': ' '})
 
-    html = f"""
+# Static HTML/JS templates, built once at import; only the ids and labels vary per call
+_TTS_TEMPLATE = """
     <button id="{button_id}" style="
         background: linear-gradient(135deg, #FF6B35 0%, #F7931E 100%);
         color: white;
@@ -77,24 +66,7 @@ def get_tts_component(text: str, button_label: str = "🔊 Listen") -> str:
     </script>
     """
 
-    return html
-
-
-def get_speech_recognition_component(input_key: str, placeholder: str = "Ask a question...") -> str:
-    """
-    Create a voice input button using Web Speech Recognition API.
-
-    Args:
-        input_key: The session state key for the text input to fill
-        placeholder: Placeholder text for the input field
-
-    Returns:
-        HTML string with the speech recognition button component
-    """
-    button_id = f"dictation-btn-{id(input_key)}"
-    status_id = f"dictation-status-{id(input_key)}"
-
-    html = f"""
+_REC_TEMPLATE = """
     <div style="margin: 10px 0;">
         <button id="{button_id}" style="
             background: linear-gradient(135deg, #17A2B8 0%, #138496 100%);
@@ -181,22 +153,10 @@ def get_speech_recognition_component(input_key: str, placeholder: str = "Ask a q
     </script>
     """
 
-    return html
-
-
-def get_sound_effect(effect_type: str) -> str:
-    """
-    Play a sound effect using Web Audio API.
-
-    Args:
-        effect_type: Type of sound ('clue', 'success', 'error')
-
-    Returns:
-        HTML string with the sound effect script
-    """
-    if effect_type == 'clue':
-        # Pleasant discovery tone
-        script = """
+# Pre-built sound effect scripts keyed by effect type
+_SOUND_SCRIPTS = {
+    # Pleasant discovery tone
+    'clue': """
         <script>
             (function() {
                 const audioContext = new (window.AudioContext || window.webkitAudioContext)();
@@ -216,10 +176,9 @@ def get_sound_effect(effect_type: str) -> str:
                 oscillator.stop(audioContext.currentTime + 0.5);
             })();
         </script>
-        """
-    elif effect_type == 'success':
-        # Celebration chord sequence
-        script = """
+        """,
+    # Celebration chord sequence
+    'success': """
         <script>
             (function() {
                 const audioContext = new (window.AudioContext || window.webkitAudioContext)();
@@ -247,10 +206,9 @@ def get_sound_effect(effect_type: str) -> str:
                 playTone(783.99, now + 0.3, 0.4);  // G
             })();
         </script>
-        """
-    elif effect_type == 'error':
-        # Alert tone
-        script = """
+        """,
+    # Alert tone
+    'error': """
         <script>
             (function() {
                 const audioContext = new (window.AudioContext || window.webkitAudioContext)();
@@ -270,11 +228,64 @@ def get_sound_effect(effect_type: str) -> str:
                 oscillator.stop(audioContext.currentTime + 0.3);
             })();
         </script>
-        """
-    else:
-        return ""
+        """,
+}
+
+
+def get_tts_component(text: str, button_label: str = "🔊 Listen") -> str:
+    """
+    Create a text-to-speech button using Web Speech API.
+
+    Args:
+        text: The text to be read aloud
+        button_label: Label for the button
+
+    Returns:
+        HTML string with the TTS button component
+    """
+    # Escape quotes and newlines for JavaScript
+    safe_text = text.translate(_JS_ESCAPES)
+    button_id = f"tts_btn_{id(text)}"
+
+    return _TTS_TEMPLATE.format(
+        button_id=button_id,
+        button_label=button_label,
+        safe_text=safe_text
+    )
+
 
-    return script
+def get_speech_recognition_component(input_key: str, placeholder: str = "Ask a question...") -> str:
+    """
+    Create a voice input button using Web Speech Recognition API.
+
+    Args:
+        input_key: The session state key for the text input to fill
+        placeholder: Placeholder text for the input field
+
+    Returns:
+        HTML string with the speech recognition button component
+    """
+    button_id = f"dictation-btn-{id(input_key)}"
+    status_id = f"dictation-status-{id(input_key)}"
+
+    return _REC_TEMPLATE.format(
+        button_id=button_id,
+        status_id=status_id,
+        placeholder=placeholder
+    )
+
+
+def get_sound_effect(effect_type: str) -> str:
+    """
+    Play a sound effect using Web Audio API.
+
+    Args:
+        effect_type: Type of sound ('clue', 'success', 'error')
+
+    Returns:
+        HTML string with the sound effect script
+    """
+    return _SOUND_SCRIPTS.get(effect_type, "")
 
 
 def play_celebration_sound() -> str:
@@ -1,11 +1,17 @@
 """Case generation using OpenAI"""
 
 import json
+import os
 import re
-from typing import Dict, Any, Optional
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import astuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from lib.types import Case, Clue, Suspect, GeneratedCase, CaseGenerationParams
-from lib.openai_client import fetch_openai_completion
-from lib.image_generator import generate_case_scene, generate_suspect_portrait, generate_clue_visualization
+from lib.openai_client import fetch_openai_json_completion_async, run_async
+from lib.llm_json import parse_json
+from lib.image_generator import generate_all_case_images_async
 import uuid
 
 
@@ -126,63 +132,113 @@ FALLBACK_CASE = {
 }
 
 
-def generate_case(params: CaseGenerationParams, generate_images: bool = True) -> GeneratedCase:
+# Parsed case data cached by generation parameters. Each key keeps a small pool
+# of distinct stories; once the pool is full, requests rotate through it instead
+# of calling the LLM. format_generated_case mints fresh IDs on every use; a
+# memoized GeneratedCase (e.g. via st.cache_data) would repeat database IDs.
+CASE_POOL_SIZE = 3
+CASE_CACHE_MAX_KEYS = 50
+
+# Seconds a pool is served before its stories are regenerated
+CASE_CACHE_TTL = 3600
+
+_case_cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+_case_cache_lock = threading.Lock()
+
+# First complete "title" string in the streamed JSON; the case object comes
+# first in the requested format, so this is the case title
+_TITLE_FIELD = re.compile(r'"title"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# Callback given progress updates such as {'stage': 'images'} or {'title': ...}
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+def _get_cached_case_data(key: Tuple) -> Optional[Dict[str, Any]]:
+    """Return the next pooled case data for a key, or None while the pool is filling"""
+    with _case_cache_lock:
+        entry = _case_cache.get(key)
+        if entry is not None and time.monotonic() - entry['created'] > CASE_CACHE_TTL:
+            del _case_cache[key]
+            return None
+        if entry is None or len(entry['pool']) < CASE_POOL_SIZE:
+            return None
+
+        _case_cache.move_to_end(key)
+        data = entry['pool'][entry['next']]
+        entry['next'] = (entry['next'] + 1) % len(entry['pool'])
+        return data
+
+
+def _store_case_data(key: Tuple, data: Dict[str, Any]):
+    """Add freshly generated case data to the pool for a key"""
+    with _case_cache_lock:
+        entry = _case_cache.get(key)
+        if entry is None or time.monotonic() - entry['created'] > CASE_CACHE_TTL:
+            entry = _case_cache[key] = {'pool': [], 'next': 0, 'created': time.monotonic()}
+        _case_cache.move_to_end(key)
+        if len(entry['pool']) < CASE_POOL_SIZE:
+            entry['pool'].append(data)
+
+        # Evict least recently used keys
+        while len(_case_cache) > CASE_CACHE_MAX_KEYS:
+            _case_cache.popitem(last=False)
+
+
+def generate_case(
+    params: CaseGenerationParams,
+    generate_images: bool = True,
+    on_progress: Optional[ProgressCallback] = None
+) -> GeneratedCase:
     """Generate a detective case using OpenAI
 
+    Synchronous wrapper around generate_case_async.
+
     Args:
         params: Case generation parameters
         generate_images: Whether to generate AI images for the case (default: True)
+        on_progress: Optional callback for progress updates
 
     Returns:
         A generated case with clues and suspects
     """
-    try:
-        # Choose prompt based on language
-        system_prompt = CASE_GENERATION_PROMPT_TH if params.language == 'th' else CASE_GENERATION_PROMPT_EN
-
-        # Create user prompt
-        if params.custom_scenario:
-            # Use custom scenario if provided - be explicit about requirements
-            if params.language == 'th':
-                user_prompt = f"สร้างคดีสืบสวนที่มีความยาก {params.difficulty} เกี่ยวกับ: {params.custom_scenario}"
-                user_prompt += "\n\nต้องมี 4-6 เบาะแส และ 3-5 ผู้ต้องสงสัย"
-            else:
-                user_prompt = f"Create a {params.difficulty} difficulty detective case about: {params.custom_scenario}"
-                user_prompt += "\n\nIMPORTANT: The case MUST include 4-6 interconnected clues and 3-5 suspects. Make sure the mystery matches the scenario description exactly."
-        else:
-            # Use standard parameters
-            if params.language == 'th':
-                user_prompt = f"สร้างคดีสืบสวนที่มีความยาก {params.difficulty}"
-            else:
-                user_prompt = f"Create a {params.difficulty} difficulty detective case"
-
-            if params.theme and params.theme != 'random':
-                user_prompt += f" with a {params.theme} theme" if params.language == 'en' else f" ในธีม {params.theme}"
-
-        if params.location:
-            user_prompt += f", set in {params.location}" if params.language == 'en' else f" ที่เกิดขึ้นใน {params.location}"
-
-        if params.era:
-            user_prompt += f", in the {params.era}" if params.language == 'en' else f" ในช่วง{params.era}"
-
-        # Prepare messages
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ]
-
-        # Call OpenAI API
-        response = fetch_openai_completion(
-            messages,
-            temperature=0.7,
-            max_tokens=8192
-        )
+    return run_async(generate_case_async(params, generate_images, on_progress))
+
+
+async def generate_case_async(
+    params: CaseGenerationParams,
+    generate_images: bool = True,
+    on_progress: Optional[ProgressCallback] = None
+) -> GeneratedCase:
+    """Generate a detective case, then all of its images concurrently
 
-        # Parse JSON response
-        parsed_data = parse_json_response(response)
+    on_progress gets {'stage': 'story'} when the story is requested, the
+    case {'title': ...} as soon as it has streamed in, and
+    {'stage': 'images'} before the images are generated.
+
+    Args:
+        params: Case generation parameters
+        generate_images: Whether to generate AI images for the case (default: True)
+        on_progress: Optional callback for progress updates
+
+    Returns:
+        A generated case with clues and suspects
+    """
+    report = on_progress or (lambda update: None)
+    try:
+        report({'stage': 'story'})
+        cache_key = astuple(params)
+        parsed_data = _get_cached_case_data(cache_key)
+        if parsed_data is None:
+            parsed_data = await _fetch_case_data(params, on_progress)
+            _store_case_data(cache_key, parsed_data)
 
         # Format into our data structure
-        return format_generated_case(parsed_data, params.language, generate_images)
+        generated = format_generated_case(parsed_data, params.language, generate_images=False)
+        report({'title': generated.case.title})
+        if generate_images:
+            report({'stage': 'images'})
+            await _add_case_images(generated)
+        return generated
 
     except Exception as e:
         error_msg = str(e)
@@ -202,6 +258,92 @@ def generate_case(params: CaseGenerationParams, generate_images: bool = True) ->
         raise Exception(f"Failed to generate case: {error_msg}") from e
 
 
+async def _fetch_case_data(
+    params: CaseGenerationParams,
+    on_progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """Request a new case from OpenAI and parse its JSON
+
+    The response is streamed, so the case title can be reported while the
+    clues and suspects are still being written.
+
+    Args:
+        params: Case generation parameters
+        on_progress: Optional callback given {'title': ...} once it arrives
+
+    Returns:
+        Parsed case data
+    """
+    # Choose prompt based on language
+    is_thai = params.language == 'th'
+    system_prompt = CASE_GENERATION_PROMPT_TH if is_thai else CASE_GENERATION_PROMPT_EN
+
+    # Create user prompt from parts, joined once at the end
+    if params.custom_scenario:
+        # Use custom scenario if provided - be explicit about requirements
+        if is_thai:
+            parts = [
+                f"สร้างคดีสืบสวนที่มีความยาก {params.difficulty} เกี่ยวกับ: {params.custom_scenario}",
+                "\n\nต้องมี 4-6 เบาะแส และ 3-5 ผู้ต้องสงสัย"
+            ]
+        else:
+            parts = [
+                f"Create a {params.difficulty} difficulty detective case about: {params.custom_scenario}",
+                "\n\nIMPORTANT: The case MUST include 4-6 interconnected clues and 3-5 suspects. Make sure the mystery matches the scenario description exactly."
+            ]
+    else:
+        # Use standard parameters
+        if is_thai:
+            parts = [f"สร้างคดีสืบสวนที่มีความยาก {params.difficulty}"]
+        else:
+            parts = [f"Create a {params.difficulty} difficulty detective case"]
+
+        if params.theme and params.theme != 'random':
+            parts.append(f" ในธีม {params.theme}" if is_thai else f" with a {params.theme} theme")
+
+    if params.location:
+        parts.append(f" ที่เกิดขึ้นใน {params.location}" if is_thai else f", set in {params.location}")
+
+    if params.era:
+        parts.append(f" ในช่วง{params.era}" if is_thai else f", in the {params.era}")
+
+    user_prompt = "".join(parts)
+
+    # Prepare messages
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+    # The title is near the start, so only the text up to it is ever joined
+    received: List[str] = []
+    title_seen = False
+
+    def _find_title(text: str):
+        nonlocal title_seen
+        if title_seen:
+            return
+        received.append(text)
+        match = _TITLE_FIELD.search("".join(received))
+        if match:
+            title_seen = True
+            try:
+                on_progress({'title': json.loads(f'"{match.group(1)}"')})
+            except ValueError:
+                pass
+
+    # Call OpenAI API, stopping as soon as the JSON object is complete
+    response = await fetch_openai_json_completion_async(
+        messages,
+        temperature=0.7,
+        max_tokens=8192,
+        on_text=_find_title if on_progress else None
+    )
+
+    # Parse JSON response
+    return parse_json_response(response)
+
+
 def parse_json_response(response: str) -> Dict[str, Any]:
     """Parse JSON from OpenAI response
 
@@ -211,23 +353,53 @@ def parse_json_response(response: str) -> Dict[str, Any]:
     Returns:
         Parsed JSON data
     """
-    # Try to extract JSON from markdown code blocks
-    json_match = (
-        re.search(r'```json\n([\s\S]*?)\n```', response) or
-        re.search(r'```([\s\S]*?)```', response) or
-        re.search(r'({[\s\S]*})', response)
-    )
-
-    json_content = json_match.group(1) if json_match else response
-
     try:
-        return json.loads(json_content)
-    except json.JSONDecodeError as e:
+        return parse_json(response)
+    except ValueError as e:
         print(f"Failed to parse JSON: {e}")
         print(f"Raw response: {response}")
         raise ValueError("Failed to parse the generated case data")
 
 
+# Alternate key names the model sometimes uses for clue fields, in priority order
+_CLUE_ALIASES = {
+    'title': ('title', 'item'),
+    'location': ('location', 'position_found'),
+    'relevance': ('relevance', 'significance'),
+}
+
+
+def _pick(d: Dict[str, Any], keys: Tuple[str, ...], default: Any = '') -> Any:
+    """Return the first non-None value found under any of the given keys
+
+    Args:
+        d: Source dictionary
+        keys: Candidate keys, in priority order
+        default: Value returned when none of the keys are present
+
+    Returns:
+        The first matching value, or default
+    """
+    for k in keys:
+        v = d.get(k)
+        if v is not None:
+            return v
+    return default
+
+
+def _new_ids(count: int) -> List[str]:
+    """Generate UUID4 strings for a batch of records from a single urandom call
+
+    Args:
+        count: Number of IDs to generate
+
+    Returns:
+        List of UUID4 strings
+    """
+    rand = os.urandom(16 * count)
+    return [str(uuid.UUID(bytes=rand[i:i + 16], version=4)) for i in range(0, len(rand), 16)]
+
+
 def format_generated_case(data: Dict[str, Any], language: str, generate_images: bool = True) -> GeneratedCase:
     """Format raw LLM output into GeneratedCase structure
 
@@ -241,44 +413,51 @@ def format_generated_case(data: Dict[str, Any], language: str, generate_images:
     """
     # Extract case data
     case_data = data.get('case', data.get('case_details', {}))
+    clues_data = data.get('clues', data.get('evidence', []))
+    suspects_data = data.get('suspects', [])
+
+    # Case fields may sit under 'case' or at the top level; merge once so the
+    # nested values win and each field is a single lookup
+    case_src = {**data, **case_data}
+
+    # One random read for the case, every clue, and every suspect
+    ids = iter(_new_ids(1 + len(clues_data) + len(suspects_data)))
 
     case = Case(
-        id=str(uuid.uuid4()),
-        title=case_data.get('title', data.get('title', 'Untitled Case')),
-        description=case_data.get('description', data.get('description', '')),
-        summary=case_data.get('summary', data.get('summary', '')),
-        difficulty=case_data.get('difficulty', data.get('difficulty', 'medium')),
+        id=next(ids),
+        title=case_src.get('title', 'Untitled Case'),
+        description=case_src.get('description', ''),
+        summary=case_src.get('summary', ''),
+        difficulty=case_src.get('difficulty', 'medium'),
         solved=False,
-        location=case_data.get('location', data.get('location', '')),
-        dateTime=case_data.get('dateTime', data.get('dateTime', '')),
+        location=case_src.get('location', ''),
+        dateTime=case_src.get('dateTime', ''),
         imageUrl="/case-file.png",
         isLLMGenerated=True
     )
 
     # Extract clues
-    clues_data = data.get('clues', data.get('evidence', []))
     clues = []
     for clue_dict in clues_data:
         clue = Clue(
-            id=str(uuid.uuid4()),
+            id=next(ids),
             caseId=case.id,
-            title=clue_dict.get('title', clue_dict.get('item', 'Untitled Clue')),
+            title=_pick(clue_dict, _CLUE_ALIASES['title'], 'Untitled Clue'),
             description=clue_dict.get('description', ''),
-            location=clue_dict.get('location', clue_dict.get('position_found', '')),
+            location=_pick(clue_dict, _CLUE_ALIASES['location']),
             type=clue_dict.get('type', 'physical'),
             discovered=False,
             examined=False,
-            relevance=clue_dict.get('relevance', clue_dict.get('significance', 'important')),
+            relevance=_pick(clue_dict, _CLUE_ALIASES['relevance'], 'important'),
             emoji=clue_dict.get('emoji', '🔍')
         )
         clues.append(clue)
 
     # Extract suspects
-    suspects_data = data.get('suspects', [])
     suspects = []
     for suspect_dict in suspects_data:
         suspect = Suspect(
-            id=str(uuid.uuid4()),
+            id=next(ids),
             caseId=case.id,
             name=suspect_dict.get('name', 'Unknown Suspect'),
             description=suspect_dict.get('description', ''),
@@ -299,60 +478,36 @@ def format_generated_case(data: Dict[str, Any], language: str, generate_images:
     if suspects and not any(s.isGuilty for s in suspects):
         suspects[0].isGuilty = True
 
-    # Generate images if requested
-    # NOTE: OpenAI image URLs are temporary and expire after ~1 hour
-    # For production use, download and store images locally or in cloud storage
-    if generate_images:
-        print("Generating AI images for the case...")
-        try:
-            # Generate scene image for the case
-            print(f"Generating scene image for: {case.title}")
-            case.imageUrl = generate_case_scene(
-                title=case.title,
-                description=case.description,
-                location=case.location,
-                difficulty=case.difficulty
-            )
-            print(f"✓ Scene image generated successfully")
-        except Exception as e:
-            print(f"⚠ Failed to generate scene image: {e}")
-            case.imageUrl = "/case-file.png"
-
-        # Generate suspect portraits
-        for i, suspect in enumerate(suspects):
-            try:
-                print(f"Generating portrait for suspect {i+1}/{len(suspects)}: {suspect.name}")
-                suspect.imageUrl = generate_suspect_portrait(
-                    name=suspect.name,
-                    description=suspect.description,
-                    alibi=suspect.alibi,
-                    relationship_to_victim=suspect.background
-                )
-                print(f"✓ Portrait generated for {suspect.name}")
-            except Exception as e:
-                print(f"⚠ Failed to generate portrait for {suspect.name}: {e}")
-                suspect.imageUrl = None
-
-        # Generate clue visualizations
-        for i, clue in enumerate(clues):
-            try:
-                print(f"Generating visualization for clue {i+1}/{len(clues)}: {clue.title}")
-                clue.imageUrl = generate_clue_visualization(
-                    title=clue.title,
-                    description=clue.description,
-                    location_found=clue.location,
-                    clue_type=clue.type
-                )
-                print(f"✓ Visualization generated for {clue.title}")
-            except Exception as e:
-                print(f"⚠ Failed to generate visualization for {clue.title}: {e}")
-                clue.imageUrl = None
-
-        print("Image generation complete!")
-
-    return GeneratedCase(
+    generated = GeneratedCase(
         case=case,
         clues=clues,
         suspects=suspects,
         solution=solution_text
     )
+
+    # Generate images if requested
+    if generate_images:
+        run_async(_add_case_images(generated))
+
+    return generated
+
+
+async def _add_case_images(generated: GeneratedCase):
+    """Generate and store a case's images, pointing each imageUrl at its stored copy
+
+    Items whose image fails keep the default artwork (or none).
+
+    Args:
+        generated: The generated case to illustrate
+    """
+    case_data = generated.case.to_dict()
+    case_data['suspects'] = [s.to_dict() for s in generated.suspects]
+    case_data['clues'] = [c.to_dict() for c in generated.clues]
+
+    images = await generate_all_case_images_async(case_data)
+
+    generated.case.imageUrl = images.get('scene') or "/case-file.png"
+    for suspect, url in zip(generated.suspects, images['suspects']):
+        suspect.imageUrl = url
+    for clue, url in zip(generated.clues, images['clues']):
+        clue.imageUrl = url
@@ -1,10 +1,12 @@
 """Case solution analysis using OpenAI"""
 
+import hashlib
 import json
-import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from lib.types import Case, Suspect, Clue, CaseSolution
-from lib.openai_client import fetch_openai_completion
+from lib.llm_json import parse_json
+from lib.openai_client import fetch_openai_completion, fetch_openai_completion_async
+from lib.database import get_cached_solution, save_cached_solution
 
 
 # System prompts for solution analysis
@@ -20,6 +22,46 @@ CASE_SOLUTION_PROMPT_TH = """คุณเป็นนักสืบผู้เ
 ประเมินอย่างยุติธรรมและอธิบายเหตุผล"""
 
 
+# User prompt templates for solution analysis
+SOLUTION_USER_TEMPLATE_EN = """Case Information:
+Title: {title}
+Description: {description}
+
+All Suspects:
+{suspects}
+
+Discovered Clues:
+{clues}
+
+Proposed Solution:
+Accused Suspect: {accused}
+Evidence Used: {evidence}
+Reasoning: {reasoning}
+
+Actual Culprit: {culprit}
+
+Please evaluate the proposed solution."""
+
+SOLUTION_USER_TEMPLATE_TH = """ข้อมูลคดี:
+ชื่อคดี: {title}
+คำอธิบาย: {description}
+
+ผู้ต้องสงสัย:
+{suspects}
+
+หลักฐาน:
+{clues}
+
+คำตอบที่เสนอ:
+ผู้ต้องสงสัย: {accused}
+หลักฐาน: {evidence}
+เหตุผล: {reasoning}
+
+ผู้กระทำผิดจริง: {culprit}
+
+กรุณาประเมินคำตอบ"""
+
+
 def analyze_solution(
     case_data: Case,
     suspects: List[Suspect],
@@ -43,94 +85,125 @@ def analyze_solution(
     Returns:
         CaseSolution with verdict and feedback
     """
-    # Find the accused suspect
-    accused_suspect = next((s for s in suspects if s.id == accused_suspect_id), None)
-    if not accused_suspect:
-        raise ValueError("Accused suspect not found")
-
-    # Find the guilty suspect
-    guilty_suspect = next((s for s in suspects if s.isGuilty), None)
-    if not guilty_suspect:
-        raise ValueError("No guilty suspect found")
-
-    # Get selected evidence
-    selected_evidence = [c for c in clues if c.id in evidence_ids]
-
-    # Choose prompt based on language
-    system_prompt = CASE_SOLUTION_PROMPT_TH if language == 'th' else CASE_SOLUTION_PROMPT_EN
+    accused_suspect, guilty_suspect = find_accused_and_guilty(suspects, accused_suspect_id)
+    is_correct = accused_suspect.id == guilty_suspect.id
 
-    # Create user prompt
-    if language == 'th':
-        user_prompt = f"""ข้อมูลคดี:
-ชื่อคดี: {case_data.title}
-คำอธิบาย: {case_data.description}
+    # Reuse feedback for an identical earlier submission
+    cache_key = solution_cache_key(case_data.id, accused_suspect_id, evidence_ids, reasoning, language)
+    cached_narrative = get_cached_solution(cache_key)
+    if cached_narrative:
+        return format_case_solution(
+            {'narrative': cached_narrative},
+            accused_suspect_id,
+            evidence_ids,
+            reasoning,
+            is_correct,
+            language
+        )
 
-ผู้ต้องสงสัย:
-{chr(10).join([f'- {s.name}: {s.description}' for s in suspects])}
+    messages = build_solution_messages(
+        case_data, suspects, clues, accused_suspect, guilty_suspect,
+        evidence_ids, reasoning, language
+    )
 
-หลักฐาน:
-{chr(10).join([f'- {c.title}: {c.description}' for c in clues])}
+    try:
+        # Call OpenAI API; the prompts ask for prose, not a JSON object, so
+        # the whole response is needed
+        response = fetch_openai_completion(
+            messages,
+            temperature=0.7,
+            max_tokens=2048
+        )
 
-คำตอบที่เสนอ:
-ผู้ต้องสงสัย: {accused_suspect.name}
-หลักฐาน: {', '.join([e.title for e in selected_evidence])}
-เหตุผล: {reasoning}
+        # Parse JSON response
+        parsed_data = parse_json_response(response)
 
-ผู้กระทำผิดจริง: {guilty_suspect.name}
+        # Format the solution and store the feedback for next time
+        solution = format_case_solution(
+            parsed_data,
+            accused_suspect_id,
+            evidence_ids,
+            reasoning,
+            is_correct,
+            language
+        )
+        save_cached_solution(cache_key, case_data.id, solution.narrative)
+        return solution
 
-กรุณาประเมินคำตอบ"""
-    else:
-        user_prompt = f"""Case Information:
-Title: {case_data.title}
-Description: {case_data.description}
+    except Exception as e:
+        print(f"Solution analysis error: {e}")
+        # Return fallback solution
+        return create_fallback_solution(
+            accused_suspect_id,
+            evidence_ids,
+            reasoning,
+            is_correct,
+            language
+        )
 
-All Suspects:
-{chr(10).join([f'- {s.name}: {s.description}' for s in suspects])}
 
-Discovered Clues:
-{chr(10).join([f'- {c.title}: {c.description}' for c in clues])}
+async def analyze_solution_async(
+    case_data: Case,
+    suspects: List[Suspect],
+    clues: List[Clue],
+    accused_suspect_id: str,
+    evidence_ids: List[str],
+    reasoning: str,
+    language: str = 'en'
+) -> CaseSolution:
+    """Analyze a player's solution without blocking the event loop
 
-Proposed Solution:
-Accused Suspect: {accused_suspect.name}
-Evidence Used: {', '.join([e.title for e in selected_evidence])}
-Reasoning: {reasoning}
+    Args:
+        case_data: The case information
+        suspects: List of suspects
+        clues: List of clues
+        accused_suspect_id: ID of accused suspect
+        evidence_ids: IDs of evidence used
+        reasoning: Player's reasoning
+        language: Language code
 
-Actual Culprit: {guilty_suspect.name}
+    Returns:
+        CaseSolution with verdict and feedback
+    """
+    accused_suspect, guilty_suspect = find_accused_and_guilty(suspects, accused_suspect_id)
+    is_correct = accused_suspect.id == guilty_suspect.id
 
-Please evaluate the proposed solution."""
+    cache_key = solution_cache_key(case_data.id, accused_suspect_id, evidence_ids, reasoning, language)
+    cached_narrative = get_cached_solution(cache_key)
+    if cached_narrative:
+        return format_case_solution(
+            {'narrative': cached_narrative},
+            accused_suspect_id,
+            evidence_ids,
+            reasoning,
+            is_correct,
+            language
+        )
 
-    # Prepare messages
-    messages = [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": user_prompt}
-    ]
+    messages = build_solution_messages(
+        case_data, suspects, clues, accused_suspect, guilty_suspect,
+        evidence_ids, reasoning, language
+    )
 
     try:
-        # Call OpenAI API
-        response = fetch_openai_completion(
+        response = await fetch_openai_completion_async(
             messages,
             temperature=0.7,
             max_tokens=2048
         )
-
-        # Parse JSON response
-        parsed_data = parse_json_response(response)
-
-        # Format the solution
-        is_correct = accused_suspect.id == guilty_suspect.id
-        return format_case_solution(
-            parsed_data,
+        solution = format_case_solution(
+            parse_json_response(response),
             accused_suspect_id,
             evidence_ids,
             reasoning,
             is_correct,
             language
         )
+        save_cached_solution(cache_key, case_data.id, solution.narrative)
+        return solution
 
     except Exception as e:
         print(f"Solution analysis error: {e}")
-        # Return fallback solution
-        is_correct = accused_suspect.id == guilty_suspect.id
         return create_fallback_solution(
             accused_suspect_id,
             evidence_ids,
@@ -140,20 +213,111 @@ Please evaluate the proposed solution."""
         )
 
 
-def parse_json_response(response: str) -> Dict[str, Any]:
-    """Parse JSON from OpenAI response"""
-    json_match = (
-        re.search(r'```json\n([\s\S]*?)\n```', response) or
-        re.search(r'```([\s\S]*?)```', response) or
-        re.search(r'({[\s\S]*})', response)
+def solution_cache_key(
+    case_id: str,
+    accused_suspect_id: str,
+    evidence_ids: List[str],
+    reasoning: str,
+    language: str = 'en'
+) -> str:
+    """Hash a solution submission for the feedback cache
+
+    Args:
+        case_id: ID of the case
+        accused_suspect_id: ID of accused suspect
+        evidence_ids: IDs of evidence used
+        reasoning: Player's reasoning
+        language: Language code
+
+    Returns:
+        Hex SHA-256 digest identifying the submission
+    """
+    payload = json.dumps({
+        "case": case_id,
+        "accused": accused_suspect_id,
+        "evidence": sorted(evidence_ids),
+        "reasoning": hashlib.sha256(reasoning.encode('utf-8')).hexdigest(),
+        "lang": language
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def find_accused_and_guilty(suspects: List[Suspect], accused_suspect_id: str) -> Tuple[Suspect, Suspect]:
+    """Look up the accused and the actually guilty suspect
+
+    Args:
+        suspects: List of suspects
+        accused_suspect_id: ID of accused suspect
+
+    Returns:
+        Tuple of (accused_suspect, guilty_suspect)
+    """
+    # Find the accused suspect
+    accused_suspect = next((s for s in suspects if s.id == accused_suspect_id), None)
+    if not accused_suspect:
+        raise ValueError("Accused suspect not found")
+
+    # Find the guilty suspect
+    guilty_suspect = next((s for s in suspects if s.isGuilty), None)
+    if not guilty_suspect:
+        raise ValueError("No guilty suspect found")
+
+    return accused_suspect, guilty_suspect
+
+
+def build_solution_messages(
+    case_data: Case,
+    suspects: List[Suspect],
+    clues: List[Clue],
+    accused_suspect: Suspect,
+    guilty_suspect: Suspect,
+    evidence_ids: List[str],
+    reasoning: str,
+    language: str = 'en'
+) -> List[Dict[str, str]]:
+    """Build the chat messages for a solution evaluation request
+
+    Args:
+        case_data: The case information
+        suspects: List of suspects
+        clues: List of clues
+        accused_suspect: The suspect the player accused
+        guilty_suspect: The actual culprit
+        evidence_ids: IDs of evidence used
+        reasoning: Player's reasoning
+        language: Language code
+
+    Returns:
+        List of message dicts with 'role' and 'content'
+    """
+    # Get selected evidence
+    selected_evidence = [c for c in clues if c.id in evidence_ids]
+
+    # Choose prompt based on language
+    system_prompt = CASE_SOLUTION_PROMPT_TH if language == 'th' else CASE_SOLUTION_PROMPT_EN
+
+    # Create user prompt
+    template = SOLUTION_USER_TEMPLATE_TH if language == 'th' else SOLUTION_USER_TEMPLATE_EN
+    user_prompt = template.format(
+        title=case_data.title,
+        description=case_data.description,
+        suspects="\n".join(f"- {s.name}: {s.description}" for s in suspects),
+        clues="\n".join(f"- {c.title}: {c.description}" for c in clues),
+        accused=accused_suspect.name,
+        evidence=", ".join(e.title for e in selected_evidence),
+        reasoning=reasoning,
+        culprit=guilty_suspect.name
     )
 
-    json_content = json_match.group(1) if json_match else response
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
 
-    try:
-        return json.loads(json_content)
-    except json.JSONDecodeError:
-        return {"narrative": response}
+
+def parse_json_response(response: str) -> Dict[str, Any]:
+    """Parse JSON from OpenAI response"""
+    return parse_json(response, fallback={"narrative": response})
 
 
 def format_case_solution(
@@ -1,10 +1,21 @@
 """Clue analysis using OpenAI"""
 
+import asyncio
+import hashlib
 import json
-import re
 from typing import List, Dict, Any
 from lib.types import Clue, Suspect, Case, ClueAnalysis, ClueAnalysisConnection
-from lib.openai_client import fetch_openai_completion
+from lib.llm_json import parse_json
+from lib.openai_client import fetch_openai_json_completion, fetch_openai_json_completion_async, run_async
+from lib.openai_batch import build_batch_request, submit_batch, wait_for_batch
+from lib.database import (
+    save_clue_analysis, get_clue_analysis, save_clue_analysis_batch,
+    get_pending_clue_analysis_batch, update_clue_analysis_batch_status
+)
+
+
+# Upper bound on in-flight analysis requests when analyzing clues in bulk
+MAX_CONCURRENT_ANALYSES = 8
 
 
 # System prompts for clue analysis
@@ -42,6 +53,38 @@ CLUE_ANALYSIS_PROMPT_TH = """คุณเป็นเพื่อนนักส
 ตอบในรูปแบบ JSON"""
 
 
+# User prompt templates for clue analysis
+CLUE_USER_TEMPLATE_EN = """Case Information:
+Title: {title}
+Summary: {summary}
+Location: {location}
+
+Clue to Analyze:
+Title: {clue_title}
+Description: {clue_description}
+Location Found: {clue_location}
+
+Suspects:
+{suspects}
+
+Please analyze this clue and provide connections to suspects."""
+
+CLUE_USER_TEMPLATE_TH = """ข้อมูลคดี:
+ชื่อคดี: {title}
+สรุป: {summary}
+สถานที่: {location}
+
+หลักฐานที่ต้องการวิเคราะห์:
+ชื่อ: {clue_title}
+คำอธิบาย: {clue_description}
+สถานที่พบ: {clue_location}
+
+ผู้ต้องสงสัย:
+{suspects}
+
+กรุณาวิเคราะห์หลักฐานนี้"""
+
+
 def analyze_clue(
     clue: Clue,
     suspects: List[Suspect],
@@ -61,87 +104,291 @@ def analyze_clue(
     Returns:
         ClueAnalysis with summary, connections, and next steps
     """
-    # Choose prompt based on language
-    system_prompt = CLUE_ANALYSIS_PROMPT_TH if language == 'th' else CLUE_ANALYSIS_PROMPT_EN
+    # Reuse a stored analysis generated from the same inputs
+    cache_key = clue_cache_key(clue, suspects, case_data, language)
+    cached = get_clue_analysis(clue.id, cache_key)
+    if cached:
+        return clue_analysis_from_dict(cached)
 
-    # Create user prompt
-    if language == 'th':
-        user_prompt = f"""ข้อมูลคดี:
-ชื่อคดี: {case_data.title}
-สรุป: {case_data.summary}
-สถานที่: {case_data.location}
+    messages = build_clue_messages(clue, suspects, case_data, language)
 
-หลักฐานที่ต้องการวิเคราะห์:
-ชื่อ: {clue.title}
-คำอธิบาย: {clue.description}
-สถานที่พบ: {clue.location}
+    try:
+        # Call OpenAI API
+        response = fetch_openai_json_completion(
+            messages,
+            temperature=0.7,
+            max_tokens=2048
+        )
 
-ผู้ต้องสงสัย:
-{chr(10).join([f'{s.name}: {s.description}' for s in suspects])}
+        # Parse JSON response
+        parsed_data = parse_json_response(response)
 
-กรุณาวิเคราะห์หลักฐานนี้"""
-    else:
-        user_prompt = f"""Case Information:
-Title: {case_data.title}
-Summary: {case_data.summary}
-Location: {case_data.location}
+        # Format the analysis and store it for next time
+        analysis = format_clue_analysis(parsed_data, suspects)
+        save_clue_analysis(clue.id, case_data.id, clue_analysis_to_dict(analysis), cache_key)
+        return analysis
 
-Clue to Analyze:
-Title: {clue.title}
-Description: {clue.description}
-Location Found: {clue.location}
+    except Exception as e:
+        print(f"Clue analysis error: {e}")
+        return create_fallback_analysis()
 
-Suspects:
-{chr(10).join([f'{s.name}: {s.description}' for s in suspects])}
 
-Please analyze this clue and provide connections to suspects."""
+async def analyze_clue_async(
+    clue: Clue,
+    suspects: List[Suspect],
+    case_data: Case,
+    discovered_clues: List[Clue],
+    language: str = 'en'
+) -> ClueAnalysis:
+    """Analyze a clue without blocking the event loop
 
-    # Prepare messages
-    messages = [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": user_prompt}
-    ]
+    Args:
+        clue: The clue to analyze
+        suspects: List of suspects
+        case_data: The case information
+        discovered_clues: Other discovered clues
+        language: Language code ('en' or 'th')
+
+    Returns:
+        ClueAnalysis with summary, connections, and next steps
+    """
+    cache_key = clue_cache_key(clue, suspects, case_data, language)
+    cached = get_clue_analysis(clue.id, cache_key)
+    if cached:
+        return clue_analysis_from_dict(cached)
+
+    messages = build_clue_messages(clue, suspects, case_data, language)
 
     try:
-        # Call OpenAI API
-        response = fetch_openai_completion(
+        response = await fetch_openai_json_completion_async(
             messages,
             temperature=0.7,
             max_tokens=2048
         )
+        analysis = format_clue_analysis(parse_json_response(response), suspects)
+        save_clue_analysis(clue.id, case_data.id, clue_analysis_to_dict(analysis), cache_key)
+        return analysis
 
-        # Parse JSON response
-        parsed_data = parse_json_response(response)
+    except Exception as e:
+        print(f"Clue analysis error: {e}")
+        return create_fallback_analysis()
 
-        # Format the analysis
-        return format_clue_analysis(parsed_data, suspects)
 
+async def analyze_clues_async(
+    clues: List[Clue],
+    suspects: List[Suspect],
+    case_data: Case,
+    discovered_clues: List[Clue],
+    language: str = 'en'
+) -> List[ClueAnalysis]:
+    """Analyze several clues concurrently
+
+    Args:
+        clues: The clues to analyze
+        suspects: List of suspects
+        case_data: The case information
+        discovered_clues: Other discovered clues
+        language: Language code ('en' or 'th')
+
+    Returns:
+        List of ClueAnalysis, in the same order as clues
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
+
+    async def _analyze(clue: Clue) -> ClueAnalysis:
+        async with semaphore:
+            return await analyze_clue_async(clue, suspects, case_data, discovered_clues, language)
+
+    return await asyncio.gather(*(_analyze(c) for c in clues))
+
+
+def analyze_clues(
+    clues: List[Clue],
+    suspects: List[Suspect],
+    case_data: Case,
+    discovered_clues: List[Clue],
+    language: str = 'en'
+) -> List[ClueAnalysis]:
+    """Analyze several clues concurrently from synchronous code
+
+    Args:
+        clues: The clues to analyze
+        suspects: List of suspects
+        case_data: The case information
+        discovered_clues: Other discovered clues
+        language: Language code ('en' or 'th')
+
+    Returns:
+        List of ClueAnalysis, in the same order as clues
+    """
+    return run_async(analyze_clues_async(clues, suspects, case_data, discovered_clues, language))
+
+
+def analyze_clues_batch(
+    clues: List[Clue],
+    suspects: List[Suspect],
+    case_data: Case,
+    language: str = 'en'
+) -> Dict[str, ClueAnalysis]:
+    """Analyze many clues through the OpenAI Batch API
+
+    Batch requests cost half as much and use a separate rate limit pool, but
+    can take minutes to hours, so this is meant for offline pre-analysis of
+    a case rather than the interactive "Analyze" button. The batch ID is
+    recorded per case so an interrupted wait resumes the same batch instead
+    of paying for a new one.
+
+    Args:
+        clues: The clues to analyze
+        suspects: List of suspects
+        case_data: The case information
+        language: Language code ('en' or 'th')
+
+    Returns:
+        Dict mapping clue ID to ClueAnalysis; each analysis is also saved
+        to the clue_analyses table
+    """
+    batch_id = get_pending_clue_analysis_batch(case_data.id)
+    if batch_id is None:
+        requests = [
+            build_batch_request(
+                clue.id,
+                build_clue_messages(clue, suspects, case_data, language),
+                temperature=0.7,
+                max_tokens=2048
+            )
+            for clue in clues
+        ]
+        batch_id = submit_batch(requests, metadata={"case_id": case_data.id})
+        save_clue_analysis_batch(batch_id, case_data.id)
+
+    try:
+        responses = wait_for_batch(batch_id)
     except Exception as e:
-        print(f"Clue analysis error: {e}")
-        # Return fallback analysis
-        return ClueAnalysis(
-            summary="This is an important clue that can help solve the mystery.",
-            connections=[],
-            nextSteps=["Continue investigating", "Look for more clues"]
+        print(f"Clue analysis batch error: {e}")
+        update_clue_analysis_batch_status(batch_id, 'failed')
+        return {}
+
+    analyses = {}
+    for clue in clues:
+        response = responses.get(clue.id)
+        if response is None:
+            continue
+        analysis = format_clue_analysis(parse_json_response(response), suspects)
+        save_clue_analysis(
+            clue.id,
+            case_data.id,
+            clue_analysis_to_dict(analysis),
+            clue_cache_key(clue, suspects, case_data, language)
         )
+        analyses[clue.id] = analysis
 
+    update_clue_analysis_batch_status(batch_id, 'completed')
+    return analyses
 
-def parse_json_response(response: str) -> Dict[str, Any]:
-    """Parse JSON from OpenAI response"""
-    # Try to extract JSON from markdown code blocks
-    json_match = (
-        re.search(r'```json\n([\s\S]*?)\n```', response) or
-        re.search(r'```([\s\S]*?)```', response) or
-        re.search(r'({[\s\S]*})', response)
+
+def build_clue_messages(
+    clue: Clue,
+    suspects: List[Suspect],
+    case_data: Case,
+    language: str = 'en'
+) -> List[Dict[str, str]]:
+    """Build the chat messages for a clue analysis request
+
+    Args:
+        clue: The clue to analyze
+        suspects: List of suspects
+        case_data: The case information
+        language: Language code ('en' or 'th')
+
+    Returns:
+        List of message dicts with 'role' and 'content'
+    """
+    # Choose prompt based on language
+    system_prompt = CLUE_ANALYSIS_PROMPT_TH if language == 'th' else CLUE_ANALYSIS_PROMPT_EN
+
+    # Create user prompt
+    template = CLUE_USER_TEMPLATE_TH if language == 'th' else CLUE_USER_TEMPLATE_EN
+    user_prompt = template.format(
+        title=case_data.title,
+        summary=case_data.summary,
+        location=case_data.location,
+        clue_title=clue.title,
+        clue_description=clue.description,
+        clue_location=clue.location,
+        suspects="\n".join(f"{s.name}: {s.description}" for s in suspects)
     )
 
-    json_content = json_match.group(1) if json_match else response
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
 
-    try:
-        return json.loads(json_content)
-    except json.JSONDecodeError:
-        # If JSON parsing fails, return empty structure
-        return {"summary": response, "connections": [], "nextSteps": []}
+def clue_cache_key(
+    clue: Clue,
+    suspects: List[Suspect],
+    case_data: Case,
+    language: str = 'en'
+) -> str:
+    """Hash the inputs a clue analysis depends on
+
+    Args:
+        clue: The clue to analyze
+        suspects: List of suspects
+        case_data: The case information
+        language: Language code ('en' or 'th')
+
+    Returns:
+        Hex SHA-256 digest identifying the analysis inputs
+    """
+    payload = json.dumps({
+        "clue": clue.id,
+        "suspects": sorted(s.id for s in suspects),
+        "case": case_data.id,
+        "lang": language
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def clue_analysis_to_dict(analysis: ClueAnalysis) -> Dict[str, Any]:
+    """Convert a ClueAnalysis to the dict stored in the database"""
+    return {
+        'summary': analysis.summary,
+        'connections': [
+            {
+                'suspectId': c.suspectId,
+                'connectionType': c.connectionType,
+                'description': c.description
+            }
+            for c in analysis.connections
+        ],
+        'nextSteps': analysis.nextSteps
+    }
+
+
+def clue_analysis_from_dict(data: Dict[str, Any]) -> ClueAnalysis:
+    """Rebuild a ClueAnalysis from its stored dict"""
+    return ClueAnalysis(
+        summary=data['summary'],
+        connections=[ClueAnalysisConnection(**c) for c in data.get('connections', [])],
+        nextSteps=data.get('nextSteps', [])
+    )
+
+
+def create_fallback_analysis() -> ClueAnalysis:
+    """Create a fallback analysis when the API call fails"""
+    return ClueAnalysis(
+        summary="This is an important clue that can help solve the mystery.",
+        connections=[],
+        nextSteps=["Continue investigating", "Look for more clues"]
+    )
+
+
+def parse_json_response(response: str) -> Dict[str, Any]:
+    """Parse JSON from OpenAI response"""
+    # If JSON parsing fails, return empty structure
+    return parse_json(response, fallback={"summary": response, "connections": [], "nextSteps": []})
 
 
 def format_clue_analysis(data: Dict[str, Any], suspects: List[Suspect]) -> ClueAnalysis:
@@ -153,12 +400,17 @@ def format_clue_analysis(data: Dict[str, Any], suspects: List[Suspect]) -> ClueA
     connections_data = data.get('connections', [])
 
     if isinstance(connections_data, list):
+        # Lowercase each suspect name once, not once per connection
+        # (reversed so the first suspect wins if two share a name)
+        suspects_lower = [(s.name.lower(), s) for s in suspects]
+        name_map = dict(reversed(suspects_lower))
+
         for conn in connections_data:
-            suspect_name = conn.get('suspect', conn.get('suspectName', ''))
+            suspect_name = conn.get('suspect', conn.get('suspectName', '')).lower()
 
-            # Find matching suspect
-            matched_suspect = next(
-                (s for s in suspects if s.name.lower() in suspect_name.lower() or suspect_name.lower() in s.name.lower()),
+            # Find matching suspect: exact name first, then partial match
+            matched_suspect = name_map.get(suspect_name) or next(
+                (s for name, s in suspects_lower if name in suspect_name or suspect_name in name),
                 None
             )
 
@@ -4,24 +4,77 @@ Stores cases, clues, suspects, images, and user progress.
 """
 
 import sqlite3
+import hashlib
 import json
 import os
-from typing import List, Dict, Optional, Any
+import queue
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from typing import List, Dict, Iterable, Optional, Any
 from pathlib import Path
 from contextlib import contextmanager
 
 # Database file path - use /data volume on Railway, fallback to local for development
 DB_PATH = os.getenv('DATABASE_PATH', '/data/detective_game.db')
 
+# Compact JSON for stored columns; keeps Thai text as UTF-8 instead of \uXXXX escapes
+_dumps = partial(json.dumps, ensure_ascii=False, separators=(',', ':'))
+
+# Image files live next to the database rather than inside it
+IMAGE_DIR = Path(DB_PATH).parent / 'images'
+
+# Downscaled copies of stored images are saved under this prefix plus the
+# full image's URL; saving a new full image drops its stale thumbnail
+THUMBNAIL_PREFIX = "thumb/"
+
 # Ensure directory exists
 Path(DB_PATH).parent.mkdir(parents=True, exist_ok=True)
 
 
+# Number of idle connections kept open for reuse
+DB_POOL_SIZE = 8
+
+# Applied once when a pooled connection is opened. WAL lets readers proceed
+# while a write is in progress and, with synchronous=NORMAL, only fsyncs at
+# checkpoints instead of on every commit.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys=ON",  # Per-connection; needed for ON DELETE CASCADE
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+_pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
+
+def _connect() -> sqlite3.Connection:
+    """Open a new configured database connection"""
+    # Streamlit runs each script rerun on a fresh thread, so pooled
+    # connections must be usable from whichever thread checks them out
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    conn.row_factory = sqlite3.Row  # Enable column access by name
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
 @contextmanager
 def get_db():
-    """Context manager for database connections"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # Enable column access by name
+    """Context manager for pooled database connections
+
+    Commits on success and rolls back on error, then returns the connection
+    to the pool instead of closing it.
+    """
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        conn = _connect()
+
     try:
         yield conn
         conn.commit()
@@ -29,7 +82,10 @@ def get_db():
         conn.rollback()
         raise e
     finally:
-        conn.close()
+        try:
+            _pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
 
 
 def init_database():
@@ -102,6 +158,18 @@ def init_database():
             )
         """)
 
+        # Image files table (image bytes are stored on disk under IMAGE_DIR,
+        # keyed by the SHA-256 of the URL; the images table above is only
+        # read as a fallback for images saved before the move)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS image_files (
+                url TEXT PRIMARY KEY,
+                key TEXT NOT NULL,
+                content_type TEXT DEFAULT 'image/png',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
         # Clue analyses table (cache AI analyses)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS clue_analyses (
@@ -115,6 +183,23 @@ def init_database():
             )
         """)
 
+        # Content hash of the inputs an analysis was generated from, so a
+        # stale analysis (suspects changed, other language) is not reused
+        cursor.execute("PRAGMA table_info(clue_analyses)")
+        if 'cache_key' not in {row['name'] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE clue_analyses ADD COLUMN cache_key TEXT")
+
+        # Solution cache table (AI feedback keyed by a hash of the submission)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS solution_cache (
+                cache_key TEXT PRIMARY KEY,
+                case_id TEXT NOT NULL,
+                narrative TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (case_id) REFERENCES cases(id) ON DELETE CASCADE
+            )
+        """)
+
         # Suspect interviews table (cache interview history)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS suspect_interviews (
@@ -128,15 +213,65 @@ def init_database():
             )
         """)
 
+        # Clue analysis batches table (OpenAI Batch API jobs, kept so a
+        # pending batch can be picked up again after a restart)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS clue_analysis_batches (
+                batch_id TEXT PRIMARY KEY,
+                case_id TEXT NOT NULL,
+                status TEXT DEFAULT 'pending',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (case_id) REFERENCES cases(id) ON DELETE CASCADE
+            )
+        """)
+
         # Create indexes for better performance
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_clues_case ON clues(caseId)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_suspects_case ON suspects(caseId)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_interviews_suspect ON suspect_interviews(suspect_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_interviews_case ON suspect_interviews(case_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_clues_case_examined ON clues(caseId, examined)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_suspects_case_interviewed ON suspects(caseId, interviewed)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_suspects_guilty ON suspects(caseId) WHERE isGuilty = 1")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_clue_analyses_case ON clue_analyses(case_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_clue_analysis_batches_case ON clue_analysis_batches(case_id, status)")
+
+
+# Schema version recorded in PRAGMA user_version; bump when adding a migration
+SCHEMA_VERSION = 1
+
+
+def migrate_database():
+    """Run one-time data migrations for databases older than SCHEMA_VERSION"""
+    with get_db() as conn:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+    if version < 1:
+        # Foreign keys were not enforced before version 1, so deleted cases
+        # left their child rows behind
+        vacuum_orphans()
+
+    if version < SCHEMA_VERSION:
+        with get_db() as conn:
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def vacuum_orphans():
+    """Delete rows whose case no longer exists and reclaim the space"""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM clues WHERE caseId NOT IN (SELECT id FROM cases)")
+        cursor.execute("DELETE FROM suspects WHERE caseId NOT IN (SELECT id FROM cases)")
+        for table in ('suspect_interviews', 'clue_analyses', 'clue_analysis_batches', 'solution_cache'):
+            cursor.execute(f"DELETE FROM {table} WHERE case_id NOT IN (SELECT id FROM cases)")
+        # VACUUM cannot run inside a transaction
+        conn.commit()
+        cursor.execute("VACUUM")
 
 
 # Initialize database on module import
 init_database()
+migrate_database()
 
 
 # ===== CASE FUNCTIONS =====
@@ -152,12 +287,25 @@ def save_case(case_data: Dict[str, Any]) -> str:
         suspects = case_data.get('suspects', [])
         solution = case_data.get('solution', '')
 
-        # Insert case
+        # Insert case (upsert rather than REPLACE: with foreign keys on, the
+        # delete half of a REPLACE would cascade to the case's child rows)
         cursor.execute("""
-            INSERT OR REPLACE INTO cases
+            INSERT INTO cases
             (id, title, description, summary, difficulty, solved, archived, location,
              dateTime, imageUrl, isLLMGenerated, solution)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                title = excluded.title,
+                description = excluded.description,
+                summary = excluded.summary,
+                difficulty = excluded.difficulty,
+                solved = excluded.solved,
+                archived = excluded.archived,
+                location = excluded.location,
+                dateTime = excluded.dateTime,
+                imageUrl = excluded.imageUrl,
+                isLLMGenerated = excluded.isLLMGenerated,
+                solution = excluded.solution
         """, (
             case.get('id'),
             case.get('title'),
@@ -173,14 +321,14 @@ def save_case(case_data: Dict[str, Any]) -> str:
             solution
         ))
 
-        # Insert clues
-        for clue in clues:
-            cursor.execute("""
-                INSERT OR REPLACE INTO clues
-                (id, caseId, title, description, location, type, discovered, examined,
-                 relevance, emoji, imageUrl)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+        # Insert clues (one prepared statement for all rows)
+        cursor.executemany("""
+            INSERT OR REPLACE INTO clues
+            (id, caseId, title, description, location, type, discovered, examined,
+             relevance, emoji, imageUrl)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
                 clue.get('id'),
                 case.get('id'),
                 clue.get('title'),
@@ -192,16 +340,18 @@ def save_case(case_data: Dict[str, Any]) -> str:
                 clue.get('relevance', 'important'),
                 clue.get('emoji', '🔍'),
                 clue.get('imageUrl')
-            ))
-
-        # Insert suspects
-        for suspect in suspects:
-            cursor.execute("""
-                INSERT OR REPLACE INTO suspects
-                (id, caseId, name, description, background, motive, alibi, isGuilty,
-                 interviewed, emoji, imageUrl)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            )
+            for clue in clues
+        ])
+
+        # Insert suspects (one prepared statement for all rows)
+        cursor.executemany("""
+            INSERT OR REPLACE INTO suspects
+            (id, caseId, name, description, background, motive, alibi, isGuilty,
+             interviewed, emoji, imageUrl)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
                 suspect.get('id'),
                 case.get('id'),
                 suspect.get('name'),
@@ -213,55 +363,180 @@ def save_case(case_data: Dict[str, Any]) -> str:
                 1 if suspect.get('interviewed') else 0,
                 suspect.get('emoji', '👤'),
                 suspect.get('imageUrl')
-            ))
+            )
+            for suspect in suspects
+        ])
+
+    _invalidate_case_cache(case.get('id'))
+    return case.get('id')
+
+
+# Integer columns returned to callers as real booleans
+_CASE_BOOL_COLUMNS = ('solved', 'archived', 'isLLMGenerated')
+_CLUE_BOOL_COLUMNS = ('discovered', 'examined')
+_SUSPECT_BOOL_COLUMNS = ('isGuilty', 'interviewed')
 
-        return case.get('id')
 
+def _fetch_dicts(cursor: sqlite3.Cursor, bool_columns: tuple = ()) -> List[Dict[str, Any]]:
+    """Fetch all remaining rows as dicts, converting integer flags to booleans
 
-def get_all_cases() -> List[Dict[str, Any]]:
-    """Get all cases from the database"""
+    Column names are read from cursor.description once per query and zipped
+    with each row's values, rather than looking every name up per row as
+    dict(row) does.
+    """
+    columns = [d[0] for d in cursor.description]
+    rows = []
+    for row in cursor.fetchall():
+        item = dict(zip(columns, row))
+        for column in bool_columns:
+            item[column] = bool(item[column])
+        rows.append(item)
+    return rows
+
+
+def get_all_cases(search: str = "", include_archived: bool = True) -> List[Dict[str, Any]]:
+    """Get cases from the database, newest first
+
+    Every page rerun lists the cases, so unfiltered results are reused for up
+    to ALL_CASES_TTL seconds; writes through this module invalidate them at
+    once. Searches are filtered by SQLite and not cached. The returned list
+    may be shared between callers and must be treated as read-only.
+
+    Args:
+        search: Only return cases whose title or description contains this
+        include_archived: Whether to include archived cases
+
+    Returns:
+        List of case dicts with 'num_clues' and 'num_suspects' counts; use
+        get_case_by_id for a case's clues and suspects
+    """
+    if search:
+        return _load_all_cases(search, include_archived)
+
+    with _case_cache_lock:
+        generation = _case_cache_generation
+        cached = _all_cases_cache.get(include_archived)
+        if cached is not None:
+            loaded_at, cases = cached
+            if time.monotonic() - loaded_at < ALL_CASES_TTL:
+                return cases
+
+    cases = _load_all_cases(search, include_archived)
+
+    with _case_cache_lock:
+        # Skip caching if a write happened while the cases were loading
+        if generation == _case_cache_generation:
+            _all_cases_cache[include_archived] = (time.monotonic(), cases)
+
+    return cases
+
+
+def has_cases() -> bool:
+    """Check whether any case exists, archived or not"""
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM cases
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM cases)")
+        return bool(cursor.fetchone()[0])
+
+
+def _load_all_cases(search: str = "", include_archived: bool = True) -> List[Dict[str, Any]]:
+    """Load the matching cases with their clue and suspect counts"""
+    conditions = []
+    params: List[str] = []
+    if not include_archived:
+        conditions.append("archived = 0")
+    if search:
+        # Match the text literally; % and _ are LIKE wildcards
+        like = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        conditions.append("(title LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\')")
+        params += [like, like]
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    with get_db() as conn:
+        cursor = conn.cursor()
+        # Lists only show how many clues and suspects a case has, so count
+        # them from the caseId indexes instead of loading every row
+        cursor.execute(f"""
+            SELECT cases.*,
+                (SELECT COUNT(*) FROM clues WHERE caseId = cases.id) AS num_clues,
+                (SELECT COUNT(*) FROM suspects WHERE caseId = cases.id) AS num_suspects
+            FROM cases
+            {where}
             ORDER BY created_at DESC
-        """)
+        """, params)
+        return _fetch_dicts(cursor, _CASE_BOOL_COLUMNS)
+
 
-        cases = []
-        for row in cursor.fetchall():
-            case = dict(row)
-            # Convert integer booleans to actual booleans
-            case['solved'] = bool(case['solved'])
-            case['archived'] = bool(case['archived'])
-            case['isLLMGenerated'] = bool(case['isLLMGenerated'])
+# In-process cache of get_case_by_id results. Cases change only through the
+# functions in this module, each of which invalidates the cache, so entries
+# never go stale. Cached dicts are shared between callers and must be
+# treated as read-only.
+CASE_CACHE_SIZE = 128
+_case_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_case_cache_lock = threading.Lock()
+_case_cache_generation = 0
 
-            # Load clues and suspects
-            case['clues'] = get_case_clues(case['id'])
-            case['suspects'] = get_case_suspects(case['id'])
+# Unfiltered get_all_cases results as include_archived -> (monotonic load
+# time, cases). The TTL bounds how long writes made by other processes
+# sharing the database go unseen.
+ALL_CASES_TTL = 30.0
+_all_cases_cache: Dict[bool, tuple] = {}
 
-            cases.append(case)
 
-        return cases
+def _invalidate_case_cache(case_id: Optional[str] = None):
+    """Drop one case (or every case, if case_id is None) from the case cache
+
+    The cached case list is always dropped, since any write can change it.
+    """
+    global _case_cache_generation
+    with _case_cache_lock:
+        _case_cache_generation += 1
+        _all_cases_cache.clear()
+        if case_id is None:
+            _case_cache.clear()
+        else:
+            _case_cache.pop(case_id, None)
 
 
 def get_case_by_id(case_id: str) -> Optional[Dict[str, Any]]:
     """Get a specific case by ID"""
+    with _case_cache_lock:
+        case = _case_cache.get(case_id)
+        if case is not None:
+            _case_cache.move_to_end(case_id)
+            return case
+        generation = _case_cache_generation
+
+    case = _load_case(case_id)
+
+    if case is not None:
+        with _case_cache_lock:
+            # Skip caching if a write happened while the case was loading
+            if generation == _case_cache_generation:
+                _case_cache[case_id] = case
+                if len(_case_cache) > CASE_CACHE_SIZE:
+                    _case_cache.popitem(last=False)
+
+    return case
+
+
+def _load_case(case_id: str) -> Optional[Dict[str, Any]]:
+    """Load a case with its clues and suspects from the database"""
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM cases WHERE id = ?", (case_id,))
-        row = cursor.fetchone()
+        rows = _fetch_dicts(cursor, _CASE_BOOL_COLUMNS)
 
-        if not row:
+        if not rows:
             return None
 
-        case = dict(row)
-        case['solved'] = bool(case['solved'])
-        case['archived'] = bool(case['archived'])
-        case['isLLMGenerated'] = bool(case['isLLMGenerated'])
+        case = rows[0]
 
-        # Load clues and suspects
-        case['clues'] = get_case_clues(case_id)
-        case['suspects'] = get_case_suspects(case_id)
+        # Load clues and suspects on the same connection
+        cursor.execute("SELECT * FROM clues WHERE caseId = ?", (case_id,))
+        case['clues'] = _fetch_dicts(cursor, _CLUE_BOOL_COLUMNS)
+        cursor.execute("SELECT * FROM suspects WHERE caseId = ?", (case_id,))
+        case['suspects'] = _fetch_dicts(cursor, _SUSPECT_BOOL_COLUMNS)
 
         return case
 
@@ -271,15 +546,7 @@ def get_case_clues(case_id: str) -> List[Dict[str, Any]]:
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM clues WHERE caseId = ?", (case_id,))
-
-        clues = []
-        for row in cursor.fetchall():
-            clue = dict(row)
-            clue['discovered'] = bool(clue['discovered'])
-            clue['examined'] = bool(clue['examined'])
-            clues.append(clue)
-
-        return clues
+        return _fetch_dicts(cursor, _CLUE_BOOL_COLUMNS)
 
 
 def get_case_suspects(case_id: str) -> List[Dict[str, Any]]:
@@ -287,15 +554,7 @@ def get_case_suspects(case_id: str) -> List[Dict[str, Any]]:
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM suspects WHERE caseId = ?", (case_id,))
-
-        suspects = []
-        for row in cursor.fetchall():
-            suspect = dict(row)
-            suspect['isGuilty'] = bool(suspect['isGuilty'])
-            suspect['interviewed'] = bool(suspect['interviewed'])
-            suspects.append(suspect)
-
-        return suspects
+        return _fetch_dicts(cursor, _SUSPECT_BOOL_COLUMNS)
 
 
 def update_case_status(case_id: str, solved: Optional[bool] = None, archived: Optional[bool] = None):
@@ -309,14 +568,18 @@ def update_case_status(case_id: str, solved: Optional[bool] = None, archived: Op
         if archived is not None:
             cursor.execute("UPDATE cases SET archived = ? WHERE id = ?", (1 if archived else 0, case_id))
 
+    _invalidate_case_cache(case_id)
+
 
 def delete_case(case_id: str):
     """Delete a case and all related data"""
     with get_db() as conn:
         cursor = conn.cursor()
-        # Foreign key constraints will cascade the deletion
+        # Foreign key constraints (enabled per connection) cascade the deletion
         cursor.execute("DELETE FROM cases WHERE id = ?", (case_id,))
 
+    _invalidate_case_cache(case_id)
+
 
 # ===== CLUE FUNCTIONS =====
 
@@ -334,32 +597,45 @@ def mark_clue_examined(clue_id: str):
         cursor = conn.cursor()
         cursor.execute("UPDATE clues SET examined = 1 WHERE id = ?", (clue_id,))
 
+    # The clue's case is not known here; flag changes are rare enough to
+    # simply clear the whole cache
+    _invalidate_case_cache()
 
-def save_clue_analysis(clue_id: str, case_id: str, analysis: Dict[str, Any]):
+
+def save_clue_analysis(
+    clue_id: str,
+    case_id: str,
+    analysis: Dict[str, Any],
+    cache_key: Optional[str] = None
+):
     """Save AI analysis of a clue"""
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             INSERT OR REPLACE INTO clue_analyses
-            (clue_id, case_id, summary, connections, nextSteps)
-            VALUES (?, ?, ?, ?, ?)
+            (clue_id, case_id, summary, connections, nextSteps, cache_key)
+            VALUES (?, ?, ?, ?, ?, ?)
         """, (
             clue_id,
             case_id,
             analysis.get('summary', ''),
-            json.dumps(analysis.get('connections', [])),
-            json.dumps(analysis.get('nextSteps', []))
+            _dumps(analysis.get('connections', [])),
+            _dumps(analysis.get('nextSteps', [])),
+            cache_key
         ))
 
 
-def get_clue_analysis(clue_id: str) -> Optional[Dict[str, Any]]:
-    """Get cached analysis for a clue"""
+def get_clue_analysis(clue_id: str, cache_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Get cached analysis for a clue
+
+    If cache_key is given, only an analysis saved with the same key is returned.
+    """
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM clue_analyses WHERE clue_id = ?", (clue_id,))
         row = cursor.fetchone()
 
-        if not row:
+        if not row or (cache_key is not None and row['cache_key'] != cache_key):
             return None
 
         return {
@@ -369,6 +645,61 @@ def get_clue_analysis(clue_id: str) -> Optional[Dict[str, Any]]:
         }
 
 
+def save_clue_analysis_batch(batch_id: str, case_id: str):
+    """Record a submitted clue analysis batch"""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO clue_analysis_batches (batch_id, case_id, status)
+            VALUES (?, ?, 'pending')
+        """, (batch_id, case_id))
+
+
+def get_pending_clue_analysis_batch(case_id: str) -> Optional[str]:
+    """Get the most recent unfinished clue analysis batch for a case"""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT batch_id FROM clue_analysis_batches
+            WHERE case_id = ? AND status = 'pending'
+            ORDER BY created_at DESC
+            LIMIT 1
+        """, (case_id,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+
+def update_clue_analysis_batch_status(batch_id: str, status: str):
+    """Update the status of a clue analysis batch"""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE clue_analysis_batches SET status = ? WHERE batch_id = ?",
+            (status, batch_id)
+        )
+
+
+# ===== SOLUTION FUNCTIONS =====
+
+def save_cached_solution(cache_key: str, case_id: str, narrative: str):
+    """Save AI feedback for a solution submission"""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO solution_cache (cache_key, case_id, narrative)
+            VALUES (?, ?, ?)
+        """, (cache_key, case_id, narrative))
+
+
+def get_cached_solution(cache_key: str) -> Optional[str]:
+    """Get cached AI feedback for a solution submission"""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT narrative FROM solution_cache WHERE cache_key = ?", (cache_key,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+
 # ===== SUSPECT FUNCTIONS =====
 
 def get_interviewed_suspects(case_id: str) -> List[str]:
@@ -385,6 +716,8 @@ def mark_suspect_interviewed(suspect_id: str):
         cursor = conn.cursor()
         cursor.execute("UPDATE suspects SET interviewed = 1 WHERE id = ?", (suspect_id,))
 
+    _invalidate_case_cache()
+
 
 def save_interview(suspect_id: str, case_id: str, question: str, answer: str):
     """Save an interview question and answer"""
@@ -415,27 +748,110 @@ def get_suspect_interviews(suspect_id: str) -> List[Dict[str, str]]:
 
 # ===== IMAGE FUNCTIONS =====
 
+def _image_path(key: str) -> Path:
+    """Get the on-disk path for an image key"""
+    return IMAGE_DIR / key[:2] / key
+
+
 def save_image_data(url: str, data: bytes, content_type: str = 'image/png'):
-    """Save image binary data to database"""
+    """Save image binary data to the image directory and index it in the database"""
+    save_image_stream(url, (data,), content_type)
+
+
+def save_image_stream(url: str, chunks: Iterable[bytes], content_type: str = 'image/png'):
+    """Save image data arriving in chunks without holding the whole image in memory"""
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    path = _image_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write to a temp file and rename so readers never see a partial image.
+    # Each writer gets its own temp file, so concurrent saves of one URL
+    # don't interleave; the last rename wins.
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix='.tmp', delete=False) as f:
+        tmp_path = Path(f.name)
+        try:
+            for chunk in chunks:
+                f.write(chunk)
+        except BaseException:
+            f.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+    os.replace(tmp_path, path)
+
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("""
-            INSERT OR REPLACE INTO images (url, data, content_type)
+            INSERT OR REPLACE INTO image_files (url, key, content_type)
             VALUES (?, ?, ?)
-        """, (url, data, content_type))
+        """, (url, key, content_type))
+        # Drop any legacy blob for this URL
+        cursor.execute("DELETE FROM images WHERE url = ?", (url,))
+
+        # A replaced image's thumbnail is stale; it is recreated on demand
+        thumb_url = f"{THUMBNAIL_PREFIX}{url}"
+        removed_thumbnail = False
+        if not url.startswith(THUMBNAIL_PREFIX):
+            cursor.execute("DELETE FROM image_files WHERE url = ?", (thumb_url,))
+            removed_thumbnail = cursor.rowcount > 0
+
+    if removed_thumbnail:
+        _image_path(hashlib.sha256(thumb_url.encode('utf-8')).hexdigest()).unlink(missing_ok=True)
+
+
+def get_stored_image_urls(urls: List[str]) -> set:
+    """Get which of the given image URLs already have stored data, in one query"""
+    if not urls:
+        return set()
+
+    placeholders = ",".join("?" * len(urls))
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT url FROM image_files WHERE url IN ({placeholders})
+            UNION
+            SELECT url FROM images WHERE url IN ({placeholders})
+        """, (*urls, *urls))
+        return {row['url'] for row in cursor.fetchall()}
+
+
+def get_image_path(url: str) -> Optional[str]:
+    """Get the file path of a stored image, if it is on disk"""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT key FROM image_files WHERE url = ?", (url,))
+        row = cursor.fetchone()
+
+    if not row:
+        return None
+
+    path = _image_path(row['key'])
+    return str(path) if path.exists() else None
 
 
 def get_image_data(url: str) -> Optional[Dict[str, Any]]:
-    """Get image binary data from database"""
+    """Get image binary data from the image directory (or the legacy images table)"""
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT data, content_type FROM images WHERE url = ?", (url,))
+        cursor.execute("SELECT key, content_type FROM image_files WHERE url = ?", (url,))
         row = cursor.fetchone()
 
         if not row:
-            return None
+            cursor.execute("SELECT data, content_type FROM images WHERE url = ?", (url,))
+            legacy = cursor.fetchone()
+            if not legacy:
+                return None
+            return {
+                'data': legacy['data'],
+                'content_type': legacy['content_type']
+            }
 
-        return {
-            'data': row['data'],
-            'content_type': row['content_type']
-        }
+    try:
+        data = _image_path(row['key']).read_bytes()
+    except OSError as e:
+        print(f"Failed to read image file for {url}: {e}")
+        return None
+
+    return {
+        'data': data,
+        'content_type': row['content_type']
+    }
@@ -1,11 +1,310 @@
 """Image generation utilities for Typhoon Detective Game"""
 
-from typing import Optional
+import asyncio
+import hashlib
+import importlib.util
+import itertools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import base64
 from io import BytesIO
-from lib.openai_client import get_openai_client
-from lib.database import save_image_data, get_image_data
+from lib.openai_client import get_openai_client, run_async
+from lib.database import (
+    THUMBNAIL_PREFIX,
+    save_image_data,
+    save_image_stream,
+    get_image_data,
+    get_stored_image_urls
+)
+from lib.logging_setup import get_logger
+
+
+log = get_logger(__name__)
+
+
+# DALL-E 3 output sizes used for each kind of image
+LANDSCAPE_SIZE = "1792x1024"
+SQUARE_SIZE = "1024x1024"
+
+# Image prompt templates, parsed once at import
+_SCENE_TEMPLATE = """Create a dramatic detective game scene illustration in a noir/mystery style.
+Scene: {title}
+Setting: {location}
+Description: {description}
+
+Style: Cinematic, atmospheric, with dramatic lighting and shadows.
+Mood: Mystery and intrigue, suitable for a {difficulty} difficulty detective case.
+Art style: Semi-realistic digital illustration with strong composition.
+No text or labels in the image."""
+
+_PORTRAIT_TEMPLATE = """Create a character portrait for a detective game suspect.
+Character: {name}
+Description: {description}
+{relationship}
+
+Style: Professional character portrait, noir detective game aesthetic.
+Mood: Mysterious and slightly suspicious, befitting a murder mystery suspect.
+Composition: Head and shoulders portrait with neutral background.
+Art style: Semi-realistic illustration with good detail and character.
+No text or labels in the image."""
+
+_CLUE_TEMPLATE = """Create an illustration of evidence/clue for a detective game.
+Evidence: {title}
+Description: {description}
+Found at: {location}
+{clue_type}
+
+Style: Detailed illustration of the evidence item, detective/crime scene aesthetic.
+Composition: Clear view of the evidence, possibly with subtle crime scene context.
+Mood: Forensic, investigative, important evidence.
+Art style: Semi-realistic, clear and detailed rendering.
+No text or labels in the image."""
+
+_LOCATION_TEMPLATE = """Create a location illustration for a detective game.
+Location: {name}
+Description: {description}
+{atmosphere}
+
+Style: Atmospheric location shot, noir detective game aesthetic.
+Composition: Wide establishing shot showing the location clearly.
+Mood: Mystery and intrigue.
+Art style: Semi-realistic digital illustration with dramatic lighting.
+No text or labels in the image."""
+
+# Upper bound on in-flight image generation requests
+MAX_CONCURRENT_IMAGES = 5
+
+# Worker threads used to download and store generated images
+MAX_DOWNLOAD_WORKERS = 8
+
+# Shared HTTP session so image downloads reuse pooled keep-alive connections
+# and retry transient gateway errors from the image CDN
+DOWNLOAD_RETRY = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(max_retries=DOWNLOAD_RETRY, pool_connections=16, pool_maxsize=16))
+
+# Bytes read per chunk when downloading an image
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Downloaded images are re-encoded as WebP when Pillow is available
+PILLOW_AVAILABLE = importlib.util.find_spec('PIL') is not None
+WEBP_QUALITY = 85
+
+# Longest side, in pixels, of the clue and suspect images shown beside their
+# text; the full-size image is only needed where it spans the page
+THUMBNAIL_SIZE = 384
+THUMBNAIL_QUALITY = 80
+
+_DOWNLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS, thread_name_prefix="image-download")
+
+# Image store identifiers of generated images are prefixed with this
+PROMPT_CACHE_PREFIX = "prompt/"
+
+# Generated image URLs whose bytes are already in the prompt cache, mapped to
+# their cache identifier so download_and_store_image can skip the download.
+# generate_all_case_images_async removes its entries once they are stored;
+# callers that never store the URL leave entries behind, so the map is an
+# LRU bounded well above the images of one case. Image URLs expire within
+# hours anyway, so evicted entries are rarely still usable.
+PROMPT_CACHED_URLS_SIZE = 256
+
+_prompt_cached_urls: "OrderedDict[str, str]" = OrderedDict()
+_prompt_cached_urls_lock = threading.Lock()
+
+# Data URIs of recently displayed images, keyed by content hash, so each
+# rerun reuses the encoded string instead of base64-encoding the bytes again.
+# Entries are ~4/3 the image size, hence the small bound.
+DATA_URI_CACHE_SIZE = 64
+
+_data_uri_cache: "OrderedDict[str, str]" = OrderedDict()
+_data_uri_cache_lock = threading.Lock()
+
+
+def _prompt_cache_url(prompt: str, model: str, size: str, quality: str) -> str:
+    """Get the image store identifier for a generation request"""
+    key = hashlib.sha256("\0".join((prompt, model, size, quality)).encode('utf-8')).hexdigest()
+    return f"{PROMPT_CACHE_PREFIX}{key}"
+
+
+def is_prompt_cached(image_url: str) -> bool:
+    """Check whether a generated image URL is a prompt cache identifier"""
+    return image_url.startswith(PROMPT_CACHE_PREFIX)
+
+
+def _get_prompt_cached(cache_url: str) -> Optional[str]:
+    """Get the store identifier of a previously generated image for a request
+
+    The identifier is returned rather than the image itself, so callers that
+    keep it (e.g. as an imageUrl saved with the case) stay small.
+    """
+    return cache_url if get_stored_image_urls([cache_url]) else None
+
+
+def _download_image(image_url: str, store_url: str):
+    """Download an image into the image store, as WebP when that is smaller
+
+    DALL-E returns PNGs that are several times larger than an equivalent
+    WebP. With Pillow installed, the image is downloaded into memory and
+    re-encoded once before its single write. Without it there is nothing to
+    re-encode, so chunks go straight to disk as they arrive and the full
+    image is never held in memory.
+    """
+    with _SESSION.get(image_url, stream=True, timeout=30) as response:
+        response.raise_for_status()
+        chunks = response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+
+        if not PILLOW_AVAILABLE:
+            first = next(chunks, b'')
+            save_image_stream(store_url, itertools.chain((first,), chunks), sniff_image_type(first))
+            return
+
+        image_data = b''.join(chunks)
+
+    webp = _to_webp(image_data)
+    if webp is not None and len(webp) < len(image_data):
+        save_image_data(store_url, webp, 'image/webp')
+    else:
+        save_image_data(store_url, image_data, sniff_image_type(image_data))
+
+
+def _to_webp(image_data: bytes) -> Optional[bytes]:
+    """Re-encode an image as WebP, or None if it is already WebP or cannot be"""
+    if sniff_image_type(image_data) == 'image/webp':
+        return None
+
+    from PIL import Image
+    try:
+        with Image.open(BytesIO(image_data)) as image:
+            out = BytesIO()
+            image.save(out, 'WEBP', quality=WEBP_QUALITY, method=6)
+    except Exception as e:
+        log.warning("Failed to convert image to WebP: %s", e)
+        return None
+    return out.getvalue()
+
+
+def _make_thumbnail(image_data: bytes) -> Optional[bytes]:
+    """Downscale an image to a WebP thumbnail, or None without Pillow"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+
+    try:
+        with Image.open(BytesIO(image_data)) as image:
+            image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.LANCZOS)
+            out = BytesIO()
+            image.save(out, 'WEBP', quality=THUMBNAIL_QUALITY)
+    except Exception as e:
+        log.warning("Failed to create thumbnail: %s", e)
+        return None
+    return out.getvalue()
+
+
+def get_image_thumbnail(url: str) -> Optional[bytes]:
+    """Get a stored image scaled down for display in a narrow column
+
+    The thumbnail is created and stored the first time it is requested, and
+    dropped by the database whenever the full image is saved again. Falls
+    back to the full image when it cannot be downscaled.
+
+    Args:
+        url: Image store identifier, e.g. "clue/<id>"
+
+    Returns:
+        Image bytes, or None if no image is stored for the identifier
+    """
+    thumb_url = f"{THUMBNAIL_PREFIX}{url}"
+    thumb = get_image_data(thumb_url)
+    if thumb:
+        return thumb['data']
+
+    full = get_image_data(url)
+    if not full:
+        return None
+
+    thumbnail = _make_thumbnail(full['data'])
+    if thumbnail is None or len(thumbnail) >= len(full['data']):
+        return full['data']
+    save_image_data(thumb_url, thumbnail, 'image/webp')
+    return thumbnail
+
+
+def _store_prompt_cached(image_url: str, cache_url: str):
+    """Download a freshly generated image into the prompt cache"""
+    _download_image(image_url, cache_url)
+    with _prompt_cached_urls_lock:
+        _prompt_cached_urls[image_url] = cache_url
+        while len(_prompt_cached_urls) > PROMPT_CACHED_URLS_SIZE:
+            _prompt_cached_urls.popitem(last=False)
+
+
+def _cached_generate(prompt: str, size: str, model: str = "dall-e-3", quality: str = "standard") -> str:
+    """Generate an image, reusing the stored result for an identical request
+
+    Args:
+        prompt: Text description of the image to generate
+        size: Image size
+        model: Image model
+        quality: Image quality
+
+    Returns:
+        URL of the generated image, or its image store identifier
+        (prompt/<sha>) when served from the cache
+    """
+    cache_url = _prompt_cache_url(prompt, model, size, quality)
+    cached = _get_prompt_cached(cache_url)
+    if cached:
+        return cached
+
+    image_url = get_openai_client().generate_image(prompt=prompt, model=model, size=size, quality=quality)
+    try:
+        _store_prompt_cached(image_url, cache_url)
+    except Exception as e:
+        log.warning("Failed to cache generated image: %s", e)
+    return image_url
+
+
+async def _cached_generate_async(
+    prompt: str,
+    size: str,
+    model: str = "dall-e-3",
+    quality: str = "standard",
+    refresh: bool = False
+) -> str:
+    """Async version of _cached_generate; store access runs on the download executor
+
+    With refresh set, the cached image is ignored and replaced by a new one.
+    """
+    loop = asyncio.get_running_loop()
+    cache_url = _prompt_cache_url(prompt, model, size, quality)
+    if not refresh:
+        cached = await loop.run_in_executor(_DOWNLOAD_EXECUTOR, _get_prompt_cached, cache_url)
+        if cached:
+            return cached
+
+    image_url = await get_openai_client().generate_image_async(prompt=prompt, model=model, size=size, quality=quality)
+    try:
+        await loop.run_in_executor(_DOWNLOAD_EXECUTOR, _store_prompt_cached, image_url, cache_url)
+    except Exception as e:
+        log.warning("Failed to cache generated image: %s", e)
+    return image_url
+
+
+def case_scene_prompt(title: str, description: str, location: str, difficulty: str) -> str:
+    """Build the image prompt for a case scene"""
+    return _SCENE_TEMPLATE.format(
+        title=title,
+        location=location,
+        description=description,
+        difficulty=difficulty
+    )
 
 
 def generate_case_scene(
@@ -25,31 +324,54 @@ def generate_case_scene(
     Returns:
         URL of the generated image
     """
-    client = get_openai_client()
+    try:
+        return _cached_generate(
+            case_scene_prompt(title, description, location, difficulty),
+            LANDSCAPE_SIZE  # Landscape for scene
+        )
+    except Exception as e:
+        log.error("Failed to generate case scene: %s", e)
+        raise
 
-    # Create a detailed prompt for the scene
-    prompt = f"""Create a dramatic detective game scene illustration in a noir/mystery style.
-Scene: {title}
-Setting: {location}
-Description: {description}
 
-Style: Cinematic, atmospheric, with dramatic lighting and shadows.
-Mood: Mystery and intrigue, suitable for a {difficulty} difficulty detective case.
-Art style: Semi-realistic digital illustration with strong composition.
-No text or labels in the image."""
+async def generate_case_scene_async(
+    title: str,
+    description: str,
+    location: str,
+    difficulty: str
+) -> str:
+    """Generate a scene image for a case without blocking the event loop
 
+    Args:
+        title: Case title
+        description: Case description
+        location: Case location
+        difficulty: Case difficulty level
+
+    Returns:
+        URL of the generated image
+    """
     try:
-        return client.generate_image(
-            prompt=prompt,
-            model="dall-e-3",
-            size="1792x1024",  # Landscape for scene
-            quality="standard"
+        return await _cached_generate_async(
+            case_scene_prompt(title, description, location, difficulty),
+            LANDSCAPE_SIZE
         )
     except Exception as e:
-        print(f"Failed to generate case scene: {e}")
+        log.error("Failed to generate case scene: %s", e)
         raise
 
 
+def suspect_portrait_prompt(
+    name: str,
+    description: str,
+    relationship_to_victim: Optional[str] = None
+) -> str:
+    """Build the image prompt for a suspect portrait"""
+    relationship_text = f"Relationship to victim: {relationship_to_victim}" if relationship_to_victim else ""
+
+    return _PORTRAIT_TEMPLATE.format(name=name, description=description, relationship=relationship_text)
+
+
 def generate_suspect_portrait(
     name: str,
     description: str,
@@ -67,34 +389,60 @@ def generate_suspect_portrait(
     Returns:
         URL of the generated image
     """
-    client = get_openai_client()
+    try:
+        return _cached_generate(
+            suspect_portrait_prompt(name, description, relationship_to_victim),
+            SQUARE_SIZE  # Square for portrait
+        )
+    except Exception as e:
+        log.error("Failed to generate suspect portrait: %s", e)
+        raise
 
-    # Create a detailed prompt for the portrait
-    relationship_text = f"Relationship to victim: {relationship_to_victim}" if relationship_to_victim else ""
 
-    prompt = f"""Create a character portrait for a detective game suspect.
-Character: {name}
-Description: {description}
-{relationship_text}
+async def generate_suspect_portrait_async(
+    name: str,
+    description: str,
+    alibi: str,
+    relationship_to_victim: Optional[str] = None
+) -> str:
+    """Generate a portrait image for a suspect without blocking the event loop
 
-Style: Professional character portrait, noir detective game aesthetic.
-Mood: Mysterious and slightly suspicious, befitting a murder mystery suspect.
-Composition: Head and shoulders portrait with neutral background.
-Art style: Semi-realistic illustration with good detail and character.
-No text or labels in the image."""
+    Args:
+        name: Suspect name
+        description: Physical description and characteristics
+        alibi: Suspect's alibi
+        relationship_to_victim: How they relate to the victim
 
+    Returns:
+        URL of the generated image
+    """
     try:
-        return client.generate_image(
-            prompt=prompt,
-            model="dall-e-3",
-            size="1024x1024",  # Square for portrait
-            quality="standard"
+        return await _cached_generate_async(
+            suspect_portrait_prompt(name, description, relationship_to_victim),
+            SQUARE_SIZE
         )
     except Exception as e:
-        print(f"Failed to generate suspect portrait: {e}")
+        log.error("Failed to generate suspect portrait: %s", e)
         raise
 
 
+def clue_visualization_prompt(
+    title: str,
+    description: str,
+    location_found: str,
+    clue_type: Optional[str] = None
+) -> str:
+    """Build the image prompt for a clue visualization"""
+    type_text = f"Type: {clue_type}" if clue_type else ""
+
+    return _CLUE_TEMPLATE.format(
+        title=title,
+        description=description,
+        location=location_found,
+        clue_type=type_text
+    )
+
+
 def generate_clue_visualization(
     title: str,
     description: str,
@@ -112,32 +460,40 @@ def generate_clue_visualization(
     Returns:
         URL of the generated image
     """
-    client = get_openai_client()
+    try:
+        return _cached_generate(
+            clue_visualization_prompt(title, description, location_found, clue_type),
+            SQUARE_SIZE  # Square for evidence
+        )
+    except Exception as e:
+        log.error("Failed to generate clue visualization: %s", e)
+        raise
 
-    # Create a detailed prompt for the clue
-    type_text = f"Type: {clue_type}" if clue_type else ""
 
-    prompt = f"""Create an illustration of evidence/clue for a detective game.
-Evidence: {title}
-Description: {description}
-Found at: {location_found}
-{type_text}
+async def generate_clue_visualization_async(
+    title: str,
+    description: str,
+    location_found: str,
+    clue_type: Optional[str] = None
+) -> str:
+    """Generate a visualization for a clue without blocking the event loop
 
-Style: Detailed illustration of the evidence item, detective/crime scene aesthetic.
-Composition: Clear view of the evidence, possibly with subtle crime scene context.
-Mood: Forensic, investigative, important evidence.
-Art style: Semi-realistic, clear and detailed rendering.
-No text or labels in the image."""
+    Args:
+        title: Clue title
+        description: What the clue is
+        location_found: Where it was found
+        clue_type: Type of evidence (physical, testimonial, etc.)
 
+    Returns:
+        URL of the generated image
+    """
     try:
-        return client.generate_image(
-            prompt=prompt,
-            model="dall-e-3",
-            size="1024x1024",  # Square for evidence
-            quality="standard"
+        return await _cached_generate_async(
+            clue_visualization_prompt(title, description, location_found, clue_type),
+            SQUARE_SIZE
         )
     except Exception as e:
-        print(f"Failed to generate clue visualization: {e}")
+        log.error("Failed to generate clue visualization: %s", e)
         raise
 
 
@@ -156,60 +512,72 @@ def generate_location_image(
     Returns:
         URL of the generated image
     """
-    client = get_openai_client()
-
     # Create a detailed prompt for the location
     atmosphere_text = f"Atmosphere: {atmosphere}" if atmosphere else "Atmosphere: Mysterious and intriguing"
 
-    prompt = f"""Create a location illustration for a detective game.
-Location: {location_name}
-Description: {description}
-{atmosphere_text}
-
-Style: Atmospheric location shot, noir detective game aesthetic.
-Composition: Wide establishing shot showing the location clearly.
-Mood: Mystery and intrigue.
-Art style: Semi-realistic digital illustration with dramatic lighting.
-No text or labels in the image."""
+    prompt = _LOCATION_TEMPLATE.format(name=location_name, description=description, atmosphere=atmosphere_text)
 
     try:
-        return client.generate_image(
-            prompt=prompt,
-            model="dall-e-3",
-            size="1792x1024",  # Landscape for location
-            quality="standard"
+        return _cached_generate(
+            prompt,
+            LANDSCAPE_SIZE  # Landscape for location
         )
     except Exception as e:
-        print(f"Failed to generate location image: {e}")
+        log.error("Failed to generate location image: %s", e)
         raise
 
 
-def download_and_store_image(image_url: str, item_type: str, item_id: str) -> bytes:
+def download_and_store_image(image_url: str, item_type: str, item_id: str):
     """Download an image from URL and store it in the database
 
     Args:
         image_url: URL of the image to download
         item_type: Type of item ('case', 'clue', or 'suspect')
         item_id: ID of the item
-
-    Returns:
-        Binary image data
     """
+    # Store in database with constructed URL identifier
+    url_identifier = f"{item_type}/{item_id}"
+
     try:
-        # Download the image
-        response = requests.get(image_url, timeout=30)
-        response.raise_for_status()
+        with _prompt_cached_urls_lock:
+            cache_url = _prompt_cached_urls.get(image_url)
+        cached = get_image_data(cache_url) if cache_url else None
+
+        if cached:
+            # Already downloaded into the prompt cache when it was generated
+            image_data = cached['data']
+        elif is_prompt_cached(image_url):
+            # Served from the prompt cache
+            stored = get_image_data(image_url)
+            if not stored:
+                raise ValueError(f"Cached image {image_url} is missing")
+            image_data = stored['data']
+        else:
+            _download_image(image_url, url_identifier)
+            return
+
+        save_image_data(url_identifier, image_data, sniff_image_type(image_data))
+    except Exception as e:
+        log.warning("Failed to download and store image: %s", e)
+        raise
 
-        image_data = response.content
 
-        # Store in database with constructed URL identifier
-        url_identifier = f"{item_type}/{item_id}"
-        save_image_data(url_identifier, image_data)
+def sniff_image_type(image_data: bytes) -> str:
+    """Detect an image's MIME type from its magic bytes
 
-        return image_data
-    except Exception as e:
-        print(f"Failed to download and store image: {e}")
-        raise
+    Args:
+        image_data: Binary image data
+
+    Returns:
+        MIME type, defaulting to image/png when unrecognized
+    """
+    if image_data.startswith(b'\xff\xd8\xff'):
+        return "image/jpeg"
+    if image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP':
+        return "image/webp"
+    if image_data.startswith((b'GIF87a', b'GIF89a')):
+        return "image/gif"
+    return "image/png"
 
 
 def get_image_data_uri(image_data: bytes) -> str:
@@ -224,15 +592,33 @@ def get_image_data_uri(image_data: bytes) -> str:
     if not image_data:
         return ""
 
-    # Encode as base64
-    encoded = base64.b64encode(image_data).decode('utf-8')
+    key = hashlib.blake2b(image_data, digest_size=16).hexdigest()
+    with _data_uri_cache_lock:
+        data_uri = _data_uri_cache.get(key)
+        if data_uri is not None:
+            _data_uri_cache.move_to_end(key)
+            return data_uri
 
-    # Return as data URI (assuming PNG, could be more sophisticated)
-    return f"data:image/png;base64,{encoded}"
+    # base64 output is pure ASCII, so the cheaper ascii codec is safe
+    data_uri = f"data:{sniff_image_type(image_data)};base64," + base64.b64encode(image_data).decode('ascii')
 
+    with _data_uri_cache_lock:
+        _data_uri_cache[key] = data_uri
+        if len(_data_uri_cache) > DATA_URI_CACHE_SIZE:
+            _data_uri_cache.popitem(last=False)
+    return data_uri
 
-def generate_all_case_images(case_data: dict, generate_scene: bool = True) -> dict:
-    """Generate all images for a case and store them in the database
+
+async def generate_all_case_images_async(
+    case_data: dict,
+    generate_scene: bool = True,
+    force_regenerate: bool = False
+) -> dict:
+    """Generate all images for a case concurrently and store them in the database
+
+    Items that already have a stored image are skipped unless force_regenerate
+    is set. Remote image URLs expire, so the result holds each item's image
+    store identifier ("suspect/<id>") rather than the URL it was made from.
 
     Args:
         case_data: Dictionary containing case information with keys:
@@ -240,77 +626,165 @@ def generate_all_case_images(case_data: dict, generate_scene: bool = True) -> di
             - suspects: list of suspect dicts with 'id' field
             - clues: list of clue dicts with 'id' field
         generate_scene: Whether to generate the main scene image
+        force_regenerate: Regenerate images even if they are already stored
 
     Returns:
-        Dictionary with image URLs for various case elements
+        Dictionary with the store identifiers under 'scene' (omitted on
+        failure), 'suspects' and 'clues' (None for items that failed)
     """
-    images = {}
+    # Two-stage pipeline: generators hand each URL to a download queue as
+    # soon as it is ready, and download workers drain it while the remaining
+    # generations are still in flight
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_IMAGES)
+    downloads: asyncio.Queue = asyncio.Queue()
+
+    # Items with identical prompts share one generation request
+    generations: Dict[tuple, asyncio.Task] = {}
+    generated_urls = set()
+
+    async def _generate_once(label: str, prompt: str, size: str) -> str:
+        async with semaphore:
+            log.info("Generating %s", label)
+            return await _cached_generate_async(prompt, size, refresh=force_regenerate)
+
+    async def _generate(label: str, item_type: str, item_id: str, prompt: str, size: str) -> Optional[str]:
+        # Failures are logged and reported as None so one bad image does not
+        # sink the rest
+        if f"{item_type}/{item_id}" in stored:
+            return f"{item_type}/{item_id}"
+
+        key = (prompt, size)
+        if key not in generations:
+            generations[key] = asyncio.ensure_future(_generate_once(label, prompt, size))
+
+        try:
+            url = await generations[key]
+        except Exception as e:
+            log.error("Failed to generate %s: %s", label, e)
+            return None
+
+        generated_urls.add(url)
+        is_stored = asyncio.get_running_loop().create_future()
+        downloads.put_nowait((label, url, item_type, item_id, is_stored))
+        return f"{item_type}/{item_id}" if await is_stored else None
+
+    async def _download_worker():
+        loop = asyncio.get_running_loop()
+        while True:
+            label, url, item_type, item_id, is_stored = await downloads.get()
+            try:
+                await loop.run_in_executor(
+                    _DOWNLOAD_EXECUTOR, download_and_store_image, url, item_type, item_id
+                )
+                is_stored.set_result(True)
+            except Exception as e:
+                log.warning("Failed to download %s: %s", label, e)
+                is_stored.set_result(False)
+            finally:
+                downloads.task_done()
+
+    suspects = case_data.get('suspects', [])
+    clues = case_data.get('clues', [])
+
+    stored = set()
+    if not force_regenerate:
+        stored = await asyncio.get_running_loop().run_in_executor(
+            _DOWNLOAD_EXECUTOR,
+            get_stored_image_urls,
+            [f"case/{case_data['id']}"]
+            + [f"suspect/{suspect['id']}" for suspect in suspects]
+            + [f"clue/{clue['id']}" for clue in clues]
+        )
 
-    try:
-        # Generate scene image
-        if generate_scene:
-            print(f"Generating scene image for: {case_data.get('title', 'Unknown Case')}")
-            scene_url = generate_case_scene(
+    suspect_tasks = [
+        _generate(
+            f"portrait for suspect {i+1}/{len(suspects)}: {suspect.get('name', 'Unknown')}",
+            'suspect',
+            suspect['id'],
+            suspect_portrait_prompt(
+                name=suspect['name'],
+                description=suspect['description'],
+                relationship_to_victim=suspect.get('relationshipToVictim') or suspect.get('background')
+            ),
+            SQUARE_SIZE
+        )
+        for i, suspect in enumerate(suspects)
+    ]
+
+    clue_tasks = [
+        _generate(
+            f"visualization for clue {i+1}/{len(clues)}: {clue.get('title', 'Unknown')}",
+            'clue',
+            clue['id'],
+            clue_visualization_prompt(
+                title=clue['title'],
+                description=clue['description'],
+                location_found=clue.get('location', 'Unknown location'),
+                clue_type=clue.get('type')
+            ),
+            SQUARE_SIZE
+        )
+        for i, clue in enumerate(clues)
+    ]
+
+    images = {}
+    generate_tasks = [*suspect_tasks, *clue_tasks]
+
+    if generate_scene:
+        generate_tasks.insert(0, _generate(
+            f"scene image for: {case_data.get('title', 'Unknown Case')}",
+            'case',
+            case_data['id'],
+            case_scene_prompt(
                 title=case_data['title'],
                 description=case_data['description'],
                 location=case_data['location'],
                 difficulty=case_data.get('difficulty', 'Medium')
-            )
+            ),
+            LANDSCAPE_SIZE
+        ))
+
+    async with asyncio.TaskGroup() as group:
+        workers = [group.create_task(_download_worker()) for _ in range(MAX_DOWNLOAD_WORKERS)]
+        results = await asyncio.gather(*generate_tasks)
+        await downloads.join()
+        for worker in workers:
+            worker.cancel()
+
+    # Shared URLs stay registered until every item using them is stored
+    with _prompt_cached_urls_lock:
+        for url in generated_urls:
+            _prompt_cached_urls.pop(url, None)
+
+    if generate_scene:
+        scene_url, *results = results
+        if scene_url:
             images['scene'] = scene_url
 
-            # Download and store the image
-            try:
-                download_and_store_image(scene_url, 'case', case_data['id'])
-            except Exception as e:
-                print(f"Failed to download scene image: {e}")
-
-        # Generate suspect portraits
-        images['suspects'] = []
-        for i, suspect in enumerate(case_data.get('suspects', [])):
-            print(f"Generating portrait for suspect {i+1}/{len(case_data.get('suspects', []))}: {suspect.get('name', 'Unknown')}")
-            try:
-                portrait_url = generate_suspect_portrait(
-                    name=suspect['name'],
-                    description=suspect['description'],
-                    alibi=suspect.get('alibi', ''),
-                    relationship_to_victim=suspect.get('relationshipToVictim')
-                )
-                images['suspects'].append(portrait_url)
-
-                # Download and store the image
-                try:
-                    download_and_store_image(portrait_url, 'suspect', suspect['id'])
-                except Exception as e:
-                    print(f"Failed to download portrait for {suspect.get('name')}: {e}")
+    images['suspects'] = list(results[:len(suspects)])
+    images['clues'] = list(results[len(suspects):])
 
-            except Exception as e:
-                print(f"Failed to generate portrait for {suspect.get('name')}: {e}")
-                images['suspects'].append(None)
+    return images
 
-        # Generate clue visualizations
-        images['clues'] = []
-        for i, clue in enumerate(case_data.get('clues', [])):
-            print(f"Generating visualization for clue {i+1}/{len(case_data.get('clues', []))}: {clue.get('title', 'Unknown')}")
-            try:
-                clue_url = generate_clue_visualization(
-                    title=clue['title'],
-                    description=clue['description'],
-                    location_found=clue.get('location', 'Unknown location')
-                )
-                images['clues'].append(clue_url)
 
-                # Download and store the image
-                try:
-                    download_and_store_image(clue_url, 'clue', clue['id'])
-                except Exception as e:
-                    print(f"Failed to download clue image for {clue.get('title')}: {e}")
+def generate_all_case_images(
+    case_data: dict,
+    generate_scene: bool = True,
+    force_regenerate: bool = False
+) -> dict:
+    """Generate all images for a case and store them in the database
 
-            except Exception as e:
-                print(f"Failed to generate visualization for {clue.get('title')}: {e}")
-                images['clues'].append(None)
+    Synchronous wrapper around generate_all_case_images_async.
 
-        return images
+    Args:
+        case_data: Dictionary containing case information with keys:
+            - id, title, description, location, difficulty
+            - suspects: list of suspect dicts with 'id' field
+            - clues: list of clue dicts with 'id' field
+        generate_scene: Whether to generate the main scene image
+        force_regenerate: Regenerate images even if they are already stored
 
-    except Exception as e:
-        print(f"Error generating case images: {e}")
-        raise
+    Returns:
+        Dictionary with the store identifiers of the case's images
+    """
+    return run_async(generate_all_case_images_async(case_data, generate_scene, force_regenerate))
@@ -0,0 +1,77 @@
+"""Incremental detection of a complete JSON object in streamed LLM output"""
+
+import re
+from typing import List, Optional
+
+
+# Characters that matter to the scanner: quotes, escapes, and braces
+_STRUCTURAL = re.compile(r'["\\{}]')
+
+
+class IncrementalJSONScanner:
+    """Find the first balanced top-level JSON object across streamed chunks
+
+    Each chunk is scanned once, carrying brace depth and string/escape state
+    over chunk boundaries, so detecting the end of the object is linear in
+    the total response length instead of re-scanning the whole buffer on
+    every chunk.
+    """
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._offset = 0        # Length of all text fed so far
+        self._start = -1        # Absolute offset of the opening '{'
+        self._depth = 0
+        self._in_string = False
+        self._skip_at = -1      # Absolute offset of a backslash-escaped character
+
+    @property
+    def text(self) -> str:
+        """All text fed so far"""
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """Add a chunk of streamed text
+
+        Args:
+            chunk: The next piece of the response
+
+        Returns:
+            The complete JSON object text once its closing brace has been
+            seen, otherwise None
+        """
+        self._parts.append(chunk)
+        base = self._offset
+        self._offset += len(chunk)
+
+        pos = 0
+        if self._start == -1:
+            pos = chunk.find('{')
+            if pos == -1:
+                return None
+
+        for match in _STRUCTURAL.finditer(chunk, pos):
+            at = base + match.start()
+            if at == self._skip_at:
+                # Character escaped by a preceding backslash, possibly one
+                # that ended the previous chunk
+                continue
+
+            char = match.group()
+            if self._in_string:
+                if char == '\\':
+                    self._skip_at = at + 1
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == '{':
+                if self._start == -1:
+                    self._start = at
+                self._depth += 1
+            elif char == '}' and self._start != -1:
+                self._depth -= 1
+                if self._depth == 0:
+                    return self.text[self._start:at + 1]
+
+        return None
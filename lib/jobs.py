@@ -0,0 +1,147 @@
+"""Background jobs for long-running generation work
+
+Case generation takes a minute or more, so pages hand it to a shared worker
+pool and keep only the returned job id; each rerun checks the job's status
+instead of holding the script run open until the work finishes. Results are
+serialized on the worker too, so collecting one costs the page nothing.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict
+
+from lib.case_generator import generate_case
+from lib.types import CaseGenerationParams
+
+
+# Case generations running at once across all sessions
+MAX_JOB_WORKERS = 4
+
+# Seconds a finished job's result is kept for a session that never collects it
+JOB_RESULT_TTL = 3600
+
+_executor = ThreadPoolExecutor(max_workers=MAX_JOB_WORKERS, thread_name_prefix="jobs")
+
+# job id -> {'future': Future, 'finished': monotonic finish time or None,
+#            'progress': latest progress updates from the job}
+_jobs: Dict[str, Dict[str, Any]] = {}
+_jobs_lock = threading.Lock()
+
+
+def _prune_finished_jobs():
+    """Drop finished jobs whose results were never collected"""
+    cutoff = time.monotonic() - JOB_RESULT_TTL
+    with _jobs_lock:
+        expired = [
+            job_id for job_id, job in _jobs.items()
+            if job['finished'] is not None and job['finished'] < cutoff
+        ]
+        for job_id in expired:
+            del _jobs[job_id]
+
+
+def _generate_case_dict(
+    params: CaseGenerationParams,
+    generate_images: bool,
+    progress: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Generate a case and convert it to the dict save_case expects"""
+    return generate_case(params, generate_images, progress.update).to_dict()
+
+
+def enqueue_case_generation(params: CaseGenerationParams, generate_images: bool = True) -> str:
+    """Start generating a case in the background
+
+    Args:
+        params: Case generation parameters
+        generate_images: Whether to generate AI images for the case
+
+    Returns:
+        Job id to poll with get_job_status; the result is the case as a
+        dict ready for save_case
+    """
+    _prune_finished_jobs()
+
+    job_id = uuid.uuid4().hex
+    job = {'future': None, 'finished': None, 'progress': {}}
+
+    def _mark_finished(_: Future):
+        job['finished'] = time.monotonic()
+
+    with _jobs_lock:
+        job['future'] = _executor.submit(_generate_case_dict, params, generate_images, job['progress'])
+        _jobs[job_id] = job
+    job['future'].add_done_callback(_mark_finished)
+    return job_id
+
+
+def get_job_status(job_id: str) -> str:
+    """Get the status of a background job
+
+    Args:
+        job_id: Id returned when the job was enqueued
+
+    Returns:
+        'queued', 'started', 'finished', 'failed', or 'unknown'
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is None:
+        return 'unknown'
+
+    future = job['future']
+    if not future.done():
+        return 'started' if future.running() else 'queued'
+    if future.cancelled() or future.exception() is not None:
+        return 'failed'
+    return 'finished'
+
+
+def get_job_progress(job_id: str) -> Dict[str, Any]:
+    """Get the latest progress a background job has reported
+
+    Args:
+        job_id: Id returned when the job was enqueued
+
+    Returns:
+        Progress so far, e.g. {'stage': 'images', 'title': ...}; empty if
+        the job is unknown or has reported nothing yet
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    return dict(job['progress']) if job is not None else {}
+
+
+def pop_job_result(job_id: str) -> Any:
+    """Collect a finished job's result and forget the job
+
+    Args:
+        job_id: Id returned when the job was enqueued
+
+    Returns:
+        The job's return value
+
+    Raises:
+        KeyError: If the job id is unknown
+        Exception: Whatever the job raised, if it failed
+    """
+    with _jobs_lock:
+        job = _jobs.pop(job_id)
+    return job['future'].result()
+
+
+def cancel_job(job_id: str):
+    """Forget a job, cancelling it if it has not started yet
+
+    A job that is already running finishes in the background and its
+    result is discarded.
+
+    Args:
+        job_id: Id returned when the job was enqueued
+    """
+    with _jobs_lock:
+        job = _jobs.pop(job_id, None)
+    if job is not None:
+        job['future'].cancel()
@@ -0,0 +1,99 @@
+"""Helpers for pulling JSON out of LLM responses"""
+
+import json
+import re
+from typing import Dict, Any, Optional
+
+
+# Characters that matter to the brace scanner: quotes, escapes, and braces
+_JSON_STRUCTURAL = re.compile(r'["\\{}]')
+
+# Fallback patterns for fenced content the brace scanner cannot match
+_FENCED_JSON = re.compile(r'```json\n(.*?)\n```', re.DOTALL)
+_FENCED = re.compile(r'```(.*?)```', re.DOTALL)
+
+
+def extract_json(text: str) -> Optional[str]:
+    """Return the first balanced top-level JSON object in text
+
+    Walks forward from the first '{' tracking brace depth, ignoring braces
+    inside double-quoted strings (with backslash escapes), so nested objects
+    are matched exactly and the scan is linear in the response length.
+
+    Args:
+        text: Raw response text
+
+    Returns:
+        The JSON object substring, or None if no balanced object is found
+    """
+    start = text.find('{')
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    skip_to = -1
+    for match in _JSON_STRUCTURAL.finditer(text, start):
+        pos = match.start()
+        if pos < skip_to:
+            # Character escaped by a preceding backslash
+            continue
+
+        char = match.group()
+        if in_string:
+            if char == '\\':
+                skip_to = pos + 2
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:pos + 1]
+
+    return None
+
+
+def parse_json(text: str, fallback: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Parse the JSON object out of an LLM response
+
+    Args:
+        text: Raw response text
+        fallback: Value returned when no JSON can be parsed; if None, a
+            ValueError is raised instead
+
+    Returns:
+        Parsed JSON data, or fallback
+    """
+    stripped = text.strip()
+
+    # Fast path: the whole response is a JSON object
+    if stripped[:1] == '{':
+        try:
+            return json.loads(stripped)
+        except json.JSONDecodeError:
+            pass
+
+    # Single forward scan for the first balanced {...} object; this also
+    # finds objects wrapped in markdown code fences
+    json_content = extract_json(stripped)
+    if json_content is not None:
+        try:
+            return json.loads(json_content)
+        except json.JSONDecodeError:
+            pass
+
+    # Last resort: whatever sits inside a code fence
+    fence_match = _FENCED_JSON.search(text) or _FENCED.search(text)
+    if fence_match:
+        try:
+            return json.loads(fence_match.group(1))
+        except json.JSONDecodeError:
+            pass
+
+    if fallback is None:
+        raise ValueError("No JSON object found in response")
+    return fallback
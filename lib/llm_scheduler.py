@@ -0,0 +1,264 @@
+"""Client-side rate limiting for concurrent OpenAI requests"""
+
+import asyncio
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Mapping, Optional
+
+
+# Default account limits; override with OPENAI_TPM / OPENAI_RPM to match your tier
+DEFAULT_TOKENS_PER_MINUTE = 30000
+DEFAULT_REQUESTS_PER_MINUTE = 500
+
+# Default image generation limit; override with OPENAI_IMAGE_RPM
+DEFAULT_IMAGES_PER_MINUTE = 50
+
+# Fraction of the remaining budget kept after a 429 response
+BACKOFF_FACTOR = 0.5
+
+# Pause after a 429 whose headers give no reset time, and the longest pause honoured
+DEFAULT_RATE_LIMIT_PAUSE = 1.0
+MAX_RATE_LIMIT_PAUSE = 60.0
+
+# Durations in x-ratelimit-reset-* headers, e.g. "20ms", "1s", "6m0s"
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+
+class RateLimiter:
+    """Token bucket limiting both requests and tokens per minute
+
+    Each bucket holds up to one minute's allowance and refills continuously.
+    A request waits until both buckets have room for it, so many concurrent
+    callers can run as fast as the account allows without triggering 429s.
+    State is guarded by a thread lock rather than asyncio primitives, so one
+    limiter works across threads and across asyncio.run() event loops.
+    """
+
+    def __init__(self, tokens_per_minute: float, requests_per_minute: float):
+        """Initialize the limiter with full buckets
+
+        Args:
+            tokens_per_minute: Token allowance per minute
+            requests_per_minute: Request allowance per minute
+        """
+        self.tokens_per_minute = tokens_per_minute
+        self.requests_per_minute = requests_per_minute
+        self._tokens = float(tokens_per_minute)
+        self._requests = float(requests_per_minute)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Add the allowance accrued since the last update"""
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+        self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+
+    def _try_acquire(self, tokens: float) -> float:
+        """Take capacity for one request if available
+
+        Args:
+            tokens: Estimated tokens for the request
+
+        Returns:
+            0 if the capacity was taken, otherwise seconds to wait before retrying
+        """
+        # A request larger than a whole minute's budget would never fit
+        tokens = min(tokens, self.tokens_per_minute)
+
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+
+            self._refill(now)
+            if self._tokens >= tokens and self._requests >= 1:
+                self._tokens -= tokens
+                self._requests -= 1
+                return 0.0
+
+            token_wait = (tokens - self._tokens) * 60 / self.tokens_per_minute
+            request_wait = (1 - self._requests) * 60 / self.requests_per_minute
+            return max(token_wait, request_wait, 0.01)
+
+    async def acquire(self, tokens: float):
+        """Wait without blocking the event loop until a request may be sent
+
+        Args:
+            tokens: Estimated tokens for the request
+        """
+        while True:
+            wait = self._try_acquire(tokens)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def wait(self, tokens: float):
+        """Block the calling thread until a request may be sent
+
+        Args:
+            tokens: Estimated tokens for the request
+        """
+        while True:
+            wait = self._try_acquire(tokens)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def calibrate(self, headers: Mapping[str, str]):
+        """Clamp the buckets to the remaining allowance reported by the API
+
+        Other processes sharing the API key consume the same limits, so the
+        x-ratelimit-remaining-* response headers are the authoritative budget.
+
+        Args:
+            headers: Response headers from an OpenAI API call
+        """
+        try:
+            remaining_requests = float(headers.get('x-ratelimit-remaining-requests', 'inf'))
+            remaining_tokens = float(headers.get('x-ratelimit-remaining-tokens', 'inf'))
+        except ValueError:
+            return
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self._requests = min(self._requests, remaining_requests)
+            self._tokens = min(self._tokens, remaining_tokens)
+
+    def backoff(self, headers: Optional[Mapping[str, str]] = None):
+        """Shrink the remaining budget after the API reports a rate limit
+
+        New requests are also held back until the limit resets, as reported
+        by the 429 response's Retry-After / x-ratelimit-reset-* headers.
+
+        Args:
+            headers: Response headers from the 429 response, if available
+        """
+        pause = retry_after_seconds(headers) if headers is not None else None
+        if pause is None:
+            pause = DEFAULT_RATE_LIMIT_PAUSE
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens *= BACKOFF_FACTOR
+            self._requests *= BACKOFF_FACTOR
+            self._paused_until = max(self._paused_until, now + min(pause, MAX_RATE_LIMIT_PAUSE))
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """Parse a rate limit reset duration into seconds
+
+    Args:
+        value: Plain seconds ("1.5") or an OpenAI duration ("20ms", "6m0s")
+
+    Returns:
+        Seconds, or None if the value can't be parsed
+    """
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """Read how long to wait before retrying from rate limit response headers
+
+    Args:
+        headers: Response headers from a 429 response
+
+    Returns:
+        Seconds to wait, or None if the headers don't say
+    """
+    retry_after_ms = headers.get('retry-after-ms')
+    if retry_after_ms:
+        seconds = parse_duration(retry_after_ms)
+        if seconds is not None:
+            return seconds / 1000
+
+    retry_after = headers.get('retry-after')
+    if retry_after:
+        seconds = parse_duration(retry_after)
+        if seconds is not None:
+            return seconds
+
+    resets = [
+        parse_duration(headers[name])
+        for name in ('x-ratelimit-reset-requests', 'x-ratelimit-reset-tokens')
+        if headers.get(name)
+    ]
+    resets = [seconds for seconds in resets if seconds is not None]
+    return max(resets) if resets else None
+
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """Roughly estimate the tokens a chat request will consume
+
+    Args:
+        messages: List of message dicts with 'role' and 'content'
+        max_tokens: Maximum tokens in response
+
+    Returns:
+        Prompt length at ~4 characters per token plus the completion allowance
+    """
+    return sum(len(m.get('content') or '') for m in messages) // 4 + max_tokens
+
+
+# Shared limiter instances
+_limiter: Optional[RateLimiter] = None
+_image_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def configure(tokens_per_minute: float, requests_per_minute: float) -> RateLimiter:
+    """Replace the shared limiter with one using the given limits
+
+    Args:
+        tokens_per_minute: Token allowance per minute
+        requests_per_minute: Request allowance per minute
+
+    Returns:
+        The new shared RateLimiter
+    """
+    global _limiter
+    with _limiter_lock:
+        _limiter = RateLimiter(tokens_per_minute, requests_per_minute)
+        return _limiter
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the shared limiter, configured from OPENAI_TPM / OPENAI_RPM on first use"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter(
+                    float(os.getenv('OPENAI_TPM', DEFAULT_TOKENS_PER_MINUTE)),
+                    float(os.getenv('OPENAI_RPM', DEFAULT_REQUESTS_PER_MINUTE))
+                )
+    return _limiter
+
+
+def get_image_rate_limiter() -> RateLimiter:
+    """Get the shared image generation limiter, configured from OPENAI_IMAGE_RPM
+
+    Image requests carry no token cost, so acquire it with tokens=0.
+    """
+    global _image_limiter
+    if _image_limiter is None:
+        with _limiter_lock:
+            if _image_limiter is None:
+                images_per_minute = float(os.getenv('OPENAI_IMAGE_RPM', DEFAULT_IMAGES_PER_MINUTE))
+                _image_limiter = RateLimiter(images_per_minute, images_per_minute)
+    return _image_limiter
@@ -0,0 +1,59 @@
+"""Logging setup for the game's library modules"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+
+# Level for lib.* loggers; set LOG_LEVEL=WARNING to silence progress messages
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+
+LOG_FORMAT = "%(levelname)s %(name)s: %(message)s"
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def _configure():
+    """Route the 'lib' logger through a queue drained by a listener thread"""
+    global _configured
+    if _configured:
+        return
+
+    with _configure_lock:
+        if _configured:
+            return
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        listener = QueueListener(log_queue, handler)
+        listener.start()
+        atexit.register(listener.stop)
+
+        logger = logging.getLogger('lib')
+        logger.addHandler(QueueHandler(log_queue))
+        logger.setLevel(LOG_LEVEL)
+        logger.propagate = False
+
+        _configured = True
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Get a logger whose records are written off the calling thread
+
+    Worker threads and coroutines only enqueue records; a single listener
+    thread does the blocking writes to stderr.
+
+    Args:
+        name: Logger name, normally the module's __name__
+
+    Returns:
+        The configured logger
+    """
+    _configure()
+    return logging.getLogger(name)
@@ -0,0 +1,108 @@
+"""OpenAI Batch API helpers for bulk, non-interactive completions"""
+
+import json
+import time
+from typing import List, Dict, Any, Optional
+from lib.openai_client import get_openai_client
+
+
+# Batch endpoint and completion window accepted by the Batch API
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+
+# Seconds between status checks while waiting for a batch
+BATCH_POLL_INTERVAL = 30
+
+# Terminal batch states
+_BATCH_DONE = {'completed', 'failed', 'expired', 'cancelled'}
+
+
+def build_batch_request(
+    custom_id: str,
+    messages: List[Dict[str, str]],
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: int = 800
+) -> Dict[str, Any]:
+    """Build one Batch API request line for a chat completion
+
+    Args:
+        custom_id: ID used to match the result back to its input
+        messages: List of message dicts with 'role' and 'content'
+        model: Model to use (defaults to the client's default model)
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens in response
+
+    Returns:
+        Request dict ready to be serialized as a JSONL line
+    """
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": {
+            "model": model or get_openai_client().default_model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+    }
+
+
+def submit_batch(requests: List[Dict[str, Any]], metadata: Optional[Dict[str, str]] = None) -> str:
+    """Upload requests as a JSONL file and create a batch for them
+
+    Args:
+        requests: Request dicts from build_batch_request
+        metadata: Optional metadata stored with the batch
+
+    Returns:
+        The batch ID
+    """
+    client = get_openai_client().client
+
+    payload = "\n".join(json.dumps(r, ensure_ascii=False) for r in requests).encode('utf-8')
+    input_file = client.files.create(file=("batch.jsonl", payload), purpose="batch")
+
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=BATCH_COMPLETION_WINDOW,
+        metadata=metadata
+    )
+    return batch.id
+
+
+def wait_for_batch(batch_id: str, poll_interval: float = BATCH_POLL_INTERVAL) -> Dict[str, str]:
+    """Poll a batch until it finishes and collect its completions
+
+    Args:
+        batch_id: ID returned by submit_batch
+        poll_interval: Seconds between status checks
+
+    Returns:
+        Dict mapping custom_id to completion text; requests that failed
+        inside the batch are left out
+    """
+    client = get_openai_client().client
+
+    batch = client.batches.retrieve(batch_id)
+    while batch.status not in _BATCH_DONE:
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch_id)
+
+    if batch.status != 'completed' or not batch.output_file_id:
+        raise Exception(f"Batch {batch_id} ended with status '{batch.status}'")
+
+    results = {}
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        response = item.get('response') or {}
+        if item.get('error') or response.get('status_code') != 200:
+            print(f"Batch request {item.get('custom_id')} failed: {item.get('error')}")
+            continue
+        results[item['custom_id']] = response['body']['choices'][0]['message']['content']
+
+    return results
@@ -1,14 +1,64 @@
-"""OpenAI client for Emerson Detective Game"""
+"""OpenAI client for Emerson Detective Game
 
+Requests use OPENAI_MODEL (default gpt-4o) unless a caller passes a model.
+Interview turns pass OPENAI_INTERVIEW_MODEL (default gpt-4o-mini), since
+their short answers don't need the larger model; analyses that return
+structured JSON stay on the default.
+"""
+
+import asyncio
+import atexit
+import hashlib
+import importlib.util
+import json
 import os
-from typing import List, Dict, Optional
-from openai import OpenAI
-import streamlit as st
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Awaitable, Callable, Iterator, List, Dict, Optional, TypeVar
+from openai import AsyncOpenAI, OpenAI
 import httpx
+from lib.incremental_json import IncrementalJSONScanner
+from lib.llm_scheduler import get_rate_limiter, get_image_rate_limiter, estimate_tokens
+
+
+# Seconds close() waits for an async client on a loop running in another thread
+ASYNC_CLOSE_TIMEOUT = 5.0
+
+# Connection pool for the async client; sized so a gather() over a case's
+# clues or suspects never waits on the pool itself
+ASYNC_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=30.0)
+
+# Connection attempts retried by the async transport before a request fails
+ASYNC_CONNECT_RETRIES = 2
+
+# Connection pool for the sync client, shared by every thread in the process
+SYNC_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=30.0)
 
+# Fail fast on connect, but leave room for long generations
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+# Multiplex concurrent requests over one HTTP/2 connection when the h2
+# package (installed by httpx[http2]) is available
+HTTP2_ENABLED = importlib.util.find_spec('h2') is not None
+
+# Attempts the OpenAI SDK makes after a 429 or transient error; it waits
+# for Retry-After (or backs off exponentially) between attempts
+MAX_RETRIES = 5
+
+# Model families that accept response_format={"type": "json_object"}
+JSON_MODE_MODEL_PREFIXES = ('gpt-4o', 'gpt-4-turbo', 'gpt-4-1106', 'gpt-4-0125', 'gpt-3.5-turbo')
+
+# Model used for text embeddings
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Number of deterministic (temperature 0) responses kept in memory
+RESPONSE_CACHE_SIZE = 256
 
 # Valid OpenAI model names (as of January 2025)
-VALID_MODELS = {
+VALID_MODELS = frozenset({
     'gpt-4o',
     'gpt-4o-mini',
     'gpt-4-turbo',
@@ -23,9 +73,107 @@ VALID_MODELS = {
     'gpt-4-0125-preview',
     'gpt-4-1106-preview',
     'gpt-3.5-turbo-0125',
+})
+
+# Images a single images.generate call may return, per model
+MAX_IMAGES_PER_REQUEST = {
+    'dall-e-2': 10,
+    'dall-e-3': 1,
 }
 
+# Prefixes of model families that may have newer, unlisted variants
+KNOWN_MODEL_PREFIXES = ('gpt-4o', 'gpt-4', 'gpt-3.5', 'o1')
+
+
+# LRU cache of deterministic responses, keyed by request hash
+_response_cache: "OrderedDict[str, str]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def _response_cache_key(
+    kind: str,
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+    response_format: Optional[Dict[str, str]] = None,
+    seed: Optional[int] = None
+) -> Optional[str]:
+    """Get the cache key for a request, or None if its output is not deterministic
+
+    Args:
+        kind: Which fetch method the response is for ('text' or 'json')
+        model: Model name
+        messages: List of message dicts with 'role' and 'content'
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens in response
+        response_format: Requested response format, if any
+        seed: Sampling seed, if any
+
+    Returns:
+        sha256 hex digest of the request, or None when temperature > 0
+    """
+    if temperature > 0:
+        return None
+
+    payload = json.dumps([kind, model, messages, max_tokens, response_format, seed], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _get_cached_response(key: Optional[str]) -> Optional[str]:
+    """Get a cached response and mark it recently used"""
+    if key is None:
+        return None
+
+    with _response_cache_lock:
+        response = _response_cache.get(key)
+        if response is not None:
+            _response_cache.move_to_end(key)
+        return response
+
+
+def _store_response(key: Optional[str], response: Optional[str]):
+    """Cache a response, evicting the least recently used beyond the limit"""
+    if key is None or not response:
+        return
+
+    with _response_cache_lock:
+        _response_cache[key] = response
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+
+def _format_options(model: str, response_format: Optional[Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+    """Get the response_format request option, if the model supports it
+
+    Args:
+        model: Model name
+        response_format: Requested response format, if any
+
+    Returns:
+        Extra keyword arguments for chat.completions.create
+    """
+    if response_format and model.startswith(JSON_MODE_MODEL_PREFIXES):
+        return {"response_format": response_format}
+    return {}
+
+
+def _image_request_counts(model: str, n: int) -> List[int]:
+    """Split a request for n images into per-call counts the model accepts
+
+    Args:
+        model: Image model name
+        n: Total number of images wanted
+
+    Returns:
+        Image count for each images.generate call
+    """
+    per_request = MAX_IMAGES_PER_REQUEST.get(model, 1)
+    return [min(per_request, n - i) for i in range(0, n, per_request)]
+
 
+@lru_cache(maxsize=32)
 def validate_model_name(model: str) -> tuple[bool, str]:
     """Validate if a model name is valid
 
@@ -43,21 +191,21 @@ def validate_model_name(model: str) -> tuple[bool, str]:
         return True, ""
 
     # Check for common mistakes
-    if 'gpt-5' in model.lower():
+    model_lower = model.lower()
+    if 'gpt-5' in model_lower:
         return False, (
             f"Invalid model '{model}': GPT-5 does not exist yet. "
             f"Did you mean 'gpt-4o' (GPT-4 optimized) or 'gpt-4-turbo'?"
         )
 
-    if 'gpt-4.1' in model.lower():
+    if 'gpt-4.1' in model_lower:
         return False, (
             f"Invalid model '{model}': Model names use hyphens, not dots. "
             f"Did you mean 'gpt-4o', 'gpt-4-turbo', or 'gpt-4'?"
         )
 
     # Check if it starts with a known prefix (might be a newer model)
-    known_prefixes = ('gpt-4o', 'gpt-4', 'gpt-3.5', 'o1')
-    if any(model.startswith(prefix) for prefix in known_prefixes):
+    if model.startswith(KNOWN_MODEL_PREFIXES):
         # Might be a valid newer model, allow it but warn
         return True, f"Warning: Model '{model}' is not in the known list but has a valid prefix. Proceeding anyway."
 
@@ -69,6 +217,27 @@ def validate_model_name(model: str) -> tuple[bool, str]:
     )
 
 
+def _note_rate_limit(response: httpx.Response):
+    """Slow the shared limiter down whenever the API answers 429
+
+    Runs as an httpx response hook, so it also sees the 429s the SDK retries
+    internally, and holds back other requests until the reported reset.
+    """
+    if response.status_code != 429:
+        return
+
+    if '/images/' in response.request.url.path:
+        limiter = get_image_rate_limiter()
+    else:
+        limiter = get_rate_limiter()
+    limiter.backoff(response.headers)
+
+
+async def _note_rate_limit_async(response: httpx.Response):
+    """Async httpx response hook; see _note_rate_limit"""
+    _note_rate_limit(response)
+
+
 class OpenAIClient:
     """Client for interacting with OpenAI API"""
 
@@ -93,8 +262,13 @@ class OpenAIClient:
         # Create httpx client with proper configuration
         # This avoids issues with proxy configurations
         http_client = httpx.Client(
-            timeout=60.0,
+            timeout=HTTP_TIMEOUT,
+            http2=HTTP2_ENABLED,
             follow_redirects=True,
+            # Keep connections to the API open between calls so each request
+            # after the first skips the TCP + TLS handshake
+            limits=SYNC_HTTP_LIMITS,
+            event_hooks={"response": [_note_rate_limit]},
             # httpx automatically picks up HTTP_PROXY/HTTPS_PROXY env vars
             # Do NOT manually pass proxies parameter
         )
@@ -102,7 +276,7 @@ class OpenAIClient:
         client_kwargs = {
             "api_key": self.api_key,
             "http_client": http_client,
-            "max_retries": 2   # Retry on network errors
+            "max_retries": MAX_RETRIES   # Retry on rate limits and network errors
         }
 
         if self.base_url:
@@ -135,12 +309,115 @@ class OpenAIClient:
         elif error_msg:  # Warning message
             print(error_msg)
 
+        # Async clients are bound to the event loop they were created on, and
+        # background jobs run several loops at once, so get_async_client()
+        # keeps one per loop; entries go away with their loop
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._async_clients_lock = threading.Lock()
+
+    def get_async_client(self) -> AsyncOpenAI:
+        """Get the AsyncOpenAI client for the running event loop
+
+        httpx.AsyncClient connections cannot be shared across event loops, and
+        each asyncio.run() call starts a new one, so every loop gets its own
+        client, reused for every request within that loop. Run the work with
+        run_async() so the client is closed before its loop ends.
+
+        Returns:
+            AsyncOpenAI client sharing one pooled httpx.AsyncClient
+        """
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            client = self._async_clients.get(loop)
+            if client is not None:
+                return client
+
+            client_kwargs = {
+                "api_key": self.api_key,
+                "http_client": httpx.AsyncClient(
+                    timeout=HTTP_TIMEOUT,
+                    follow_redirects=True,
+                    event_hooks={"response": [_note_rate_limit_async]},
+                    # Pool and HTTP/2 settings live on the transport once one
+                    # is given; retries re-attempt failed connection setups
+                    transport=httpx.AsyncHTTPTransport(
+                        http2=HTTP2_ENABLED,
+                        limits=ASYNC_HTTP_LIMITS,
+                        retries=ASYNC_CONNECT_RETRIES,
+                    ),
+                ),
+                "max_retries": MAX_RETRIES
+            }
+            if self.base_url:
+                client_kwargs["base_url"] = self.base_url
+
+            client = self._async_clients[loop] = AsyncOpenAI(**client_kwargs)
+            return client
+
+    async def aclose_async_client(self):
+        """Close the running event loop's async client, if it has one"""
+        with self._async_clients_lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+    def close(self):
+        """Close the pooled connections held by this client
+
+        Async clients are closed on their own loop when it is still open:
+        by scheduling onto it if it is running elsewhere, or by running it
+        briefly if it is idle. A closed loop's client cannot be awaited any
+        more; run_async() closes clients before their loop ends, so none
+        should be left by then.
+        """
+        self.client.close()
+
+        with self._async_clients_lock:
+            clients = list(self._async_clients.items())
+            self._async_clients.clear()
+
+        for loop, client in clients:
+            try:
+                if loop.is_closed():
+                    continue
+                if loop.is_running():
+                    asyncio.run_coroutine_threadsafe(client.close(), loop).result(ASYNC_CLOSE_TIMEOUT)
+                else:
+                    loop.run_until_complete(client.close())
+            except Exception as e:
+                print(f"Failed to close async OpenAI client: {e}")
+
+    def __enter__(self) -> "OpenAIClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def warm_up(self):
+        """Open a pooled connection to the API in the background
+
+        Issues a lightweight models.list() call on a daemon thread so the
+        TLS connection is already established when the first real request
+        is made. Failures are ignored; the real request will surface them.
+        """
+        def _ping():
+            try:
+                self.client.models.list()
+            except Exception as e:
+                print(f"OpenAI warm-up request failed: {e}")
+
+        threading.Thread(target=_ping, name="openai-warm-up", daemon=True).start()
+
     def fetch_completion(
         self,
         messages: List[Dict[str, str]],
         model: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: int = 800
+        max_tokens: int = 800,
+        response_format: Optional[Dict[str, str]] = None,
+        seed: Optional[int] = None
     ) -> str:
         """Fetch completion from OpenAI API
 
@@ -149,55 +426,335 @@ class OpenAIClient:
             model: Model to use (defaults to gpt-4o)
             temperature: Sampling temperature
             max_tokens: Maximum tokens in response
+            response_format: Optional response format, e.g. {"type": "json_object"};
+                ignored for models without JSON mode
+            seed: Optional sampling seed for reproducible output
+
+        Returns:
+            The completion text
+        """
+        model = self._resolve_model(model)
+        cache_key = _response_cache_key('text', model, messages, temperature, max_tokens, response_format, seed)
+        cached = _get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+        limiter = get_rate_limiter()
+        limiter.wait(estimate_tokens(messages, max_tokens))
+
+        try:
+            raw = self.client.chat.completions.with_raw_response.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **_format_options(model, response_format),
+                **({"seed": seed} if seed is not None else {})
+            )
+            limiter.calibrate(raw.headers)
+
+            content = raw.parse().choices[0].message.content
+            _store_response(cache_key, content)
+            return content
+
+        except Exception as e:
+            raise self._completion_error(e, model) from e
+
+    async def fetch_completion_async(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 800,
+        response_format: Optional[Dict[str, str]] = None,
+        seed: Optional[int] = None
+    ) -> str:
+        """Fetch completion from OpenAI API without blocking the event loop
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            model: Model to use (defaults to gpt-4o)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            response_format: Optional response format, e.g. {"type": "json_object"};
+                ignored for models without JSON mode
+            seed: Optional sampling seed for reproducible output
 
         Returns:
             The completion text
         """
-        model = model or self.default_model
+        model = self._resolve_model(model)
+        cache_key = _response_cache_key('text', model, messages, temperature, max_tokens, response_format, seed)
+        cached = _get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+        limiter = get_rate_limiter()
+        await limiter.acquire(estimate_tokens(messages, max_tokens))
+
+        try:
+            raw = await self.get_async_client().chat.completions.with_raw_response.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **_format_options(model, response_format),
+                **({"seed": seed} if seed is not None else {})
+            )
+            limiter.calibrate(raw.headers)
+
+            content = raw.parse().choices[0].message.content
+            _store_response(cache_key, content)
+            return content
+
+        except Exception as e:
+            raise self._completion_error(e, model) from e
+
+    def stream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 800
+    ) -> Iterator[str]:
+        """Stream a completion as it is generated
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            model: Model to use (defaults to gpt-4o)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+
+        Yields:
+            Pieces of the completion text as they arrive
+        """
+        model = self._resolve_model(model)
+        limiter = get_rate_limiter()
+        limiter.wait(estimate_tokens(messages, max_tokens))
+
+        try:
+            stream = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+        except Exception as e:
+            raise self._completion_error(e, model) from e
+
+        try:
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        except Exception as e:
+            raise self._completion_error(e, model) from e
+        finally:
+            stream.close()
+
+    def fetch_json_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 800,
+        response_format: Optional[Dict[str, str]] = None
+    ) -> str:
+        """Stream a completion and stop once a complete JSON object has arrived
+
+        Anything the model writes after the closing brace is never generated,
+        so the call returns as soon as the object is complete. If no balanced
+        object appears, the full response text is returned.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            model: Model to use (defaults to gpt-4o)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            response_format: Optional response format, e.g. {"type": "json_object"};
+                ignored for models without JSON mode
+
+        Returns:
+            The JSON object text, or the complete response text
+        """
+        model = self._resolve_model(model)
+        cache_key = _response_cache_key('json', model, messages, temperature, max_tokens, response_format)
+        cached = _get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+        scanner = IncrementalJSONScanner()
+        limiter = get_rate_limiter()
+        limiter.wait(estimate_tokens(messages, max_tokens))
+
+        try:
+            stream = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                **_format_options(model, response_format)
+            )
+            try:
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        json_text = scanner.feed(delta)
+                        if json_text is not None:
+                            _store_response(cache_key, json_text)
+                            return json_text
+            finally:
+                # Closing the stream early cancels the rest of the generation
+                stream.close()
+
+            _store_response(cache_key, scanner.text)
+            return scanner.text
+
+        except Exception as e:
+            raise self._completion_error(e, model) from e
+
+    async def fetch_json_completion_async(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 800,
+        response_format: Optional[Dict[str, str]] = None,
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """Async version of fetch_json_completion
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            model: Model to use (defaults to gpt-4o)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            response_format: Optional response format, e.g. {"type": "json_object"};
+                ignored for models without JSON mode
+            on_text: Optional callback given each piece of text as it arrives
+                (the whole response at once when it was cached)
+
+        Returns:
+            The JSON object text, or the complete response text
+        """
+        model = self._resolve_model(model)
+        cache_key = _response_cache_key('json', model, messages, temperature, max_tokens, response_format)
+        cached = _get_cached_response(cache_key)
+        if cached is not None:
+            if on_text is not None:
+                on_text(cached)
+            return cached
+
+        scanner = IncrementalJSONScanner()
+        limiter = get_rate_limiter()
+        await limiter.acquire(estimate_tokens(messages, max_tokens))
+
+        try:
+            stream = await self.get_async_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                **_format_options(model, response_format)
+            )
+            try:
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        if on_text is not None:
+                            on_text(delta)
+                        json_text = scanner.feed(delta)
+                        if json_text is not None:
+                            _store_response(cache_key, json_text)
+                            return json_text
+            finally:
+                await stream.close()
+
+            _store_response(cache_key, scanner.text)
+            return scanner.text
+
+        except Exception as e:
+            raise self._completion_error(e, model) from e
+
+    def _resolve_model(self, model: Optional[str]) -> str:
+        """Pick the model for a request and validate it before the API call
+
+        Args:
+            model: Requested model, or None for the default
+
+        Returns:
+            The model name to use
+        """
+        if not model or model == self.default_model:
+            # Already validated in __init__
+            return self.default_model
 
-        # Validate the model name before making API call
         is_valid, error_msg = validate_model_name(model)
         if not is_valid:
             raise ValueError(error_msg)
         elif error_msg:  # Warning
             print(error_msg)
 
-        try:
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens
+        return model
+
+    def _completion_error(self, e: Exception, model: str) -> Exception:
+        """Translate an API exception into a more helpful error
+
+        Args:
+            e: The exception raised by the OpenAI SDK
+            model: Model the request was made with
+
+        Returns:
+            Exception to raise in place of the original
+        """
+        error_str = str(e)
+        print(f"Error calling OpenAI API: {error_str}")
+
+        # Provide more helpful error messages
+        if "model" in error_str.lower() and "does not exist" in error_str.lower():
+            return ValueError(
+                f"The model '{model}' is not recognized by OpenAI API. "
+                f"Valid models include: gpt-4o, gpt-4o-mini, gpt-4-turbo, gpt-4, gpt-3.5-turbo. "
+                f"Please check your OPENAI_MODEL environment variable."
+            )
+        elif "timeout" in error_str.lower() or "timed out" in error_str.lower():
+            return TimeoutError(
+                f"Request to OpenAI API timed out. This might be due to:\n"
+                f"1. An invalid model name ('{model}')\n"
+                f"2. Network connectivity issues\n"
+                f"3. OpenAI API being slow/unavailable\n"
+                f"Please verify your OPENAI_MODEL is set to a valid model like 'gpt-4o'"
+            )
+        elif "api_key" in error_str.lower():
+            return ValueError(
+                "Invalid or missing API key. Please check that OPENAI_API_KEY is set correctly."
             )
+        else:
+            # Wrap the original exception with additional context
+            return Exception(f"OpenAI API error: {error_str}")
 
-            return response.choices[0].message.content
+    def create_embedding(self, text: str, model: str = EMBEDDING_MODEL) -> List[float]:
+        """Embed a piece of text
+
+        Args:
+            text: Text to embed
+            model: Embedding model to use
+
+        Returns:
+            The embedding vector
+        """
+        limiter = get_rate_limiter()
+        limiter.wait(len(text) // 4 + 1)
+
+        try:
+            response = self.client.embeddings.create(model=model, input=text)
+            return response.data[0].embedding
 
         except Exception as e:
-            error_str = str(e)
-            print(f"Error calling OpenAI API: {error_str}")
-
-            # Provide more helpful error messages
-            if "model" in error_str.lower() and "does not exist" in error_str.lower():
-                raise ValueError(
-                    f"The model '{model}' is not recognized by OpenAI API. "
-                    f"Valid models include: gpt-4o, gpt-4o-mini, gpt-4-turbo, gpt-4, gpt-3.5-turbo. "
-                    f"Please check your OPENAI_MODEL environment variable."
-                ) from e
-            elif "timeout" in error_str.lower() or "timed out" in error_str.lower():
-                raise TimeoutError(
-                    f"Request to OpenAI API timed out. This might be due to:\n"
-                    f"1. An invalid model name ('{model}')\n"
-                    f"2. Network connectivity issues\n"
-                    f"3. OpenAI API being slow/unavailable\n"
-                    f"Please verify your OPENAI_MODEL is set to a valid model like 'gpt-4o'"
-                ) from e
-            elif "api_key" in error_str.lower():
-                raise ValueError(
-                    "Invalid or missing API key. Please check that OPENAI_API_KEY is set correctly."
-                ) from e
-            else:
-                # Re-raise the original exception with additional context
-                raise Exception(f"OpenAI API error: {error_str}") from e
+            raise self._completion_error(e, model) from e
 
     def generate_image(
         self,
@@ -219,51 +776,223 @@ class OpenAIClient:
         Returns:
             URL of the generated image
         """
+        return self.generate_images(prompt, model=model, size=size, quality=quality, n=n)[0]
+
+    def generate_images(
+        self,
+        prompt: str,
+        model: str = "dall-e-3",
+        size: str = "1024x1024",
+        quality: str = "standard",
+        n: int = 1
+    ) -> List[str]:
+        """Generate several images for one prompt in as few requests as possible
+
+        Args:
+            prompt: Text description of the images to generate
+            model: Model to use (default: dall-e-3, can also use dall-e-2)
+            size: Image size (1024x1024, 1792x1024, or 1024x1792 for dall-e-3)
+            quality: Image quality (standard or hd, only for dall-e-3)
+            n: Number of images to generate
+
+        Returns:
+            URLs of the generated images
+        """
+        limiter = get_image_rate_limiter()
+        urls = []
         try:
-            response = self.client.images.generate(
+            for count in _image_request_counts(model, n):
+                limiter.wait(0)
+                raw = self.client.images.with_raw_response.generate(
+                    model=model,
+                    prompt=prompt,
+                    size=size,
+                    quality=quality,
+                    n=count
+                )
+                limiter.calibrate(raw.headers)
+                urls.extend(d.url for d in raw.parse().data)
+
+            return urls
+
+        except Exception as e:
+            raise self._image_error(e) from e
+
+    async def generate_image_async(
+        self,
+        prompt: str,
+        model: str = "dall-e-3",
+        size: str = "1024x1024",
+        quality: str = "standard",
+        n: int = 1
+    ) -> str:
+        """Generate an image without blocking the event loop
+
+        Args:
+            prompt: Text description of the image to generate
+            model: Model to use (default: dall-e-3, can also use dall-e-2)
+            size: Image size (1024x1024, 1792x1024, or 1024x1792 for dall-e-3)
+            quality: Image quality (standard or hd, only for dall-e-3)
+            n: Number of images to generate
+
+        Returns:
+            URL of the generated image
+        """
+        urls = await self.generate_images_async(prompt, model=model, size=size, quality=quality, n=n)
+        return urls[0]
+
+    async def generate_images_async(
+        self,
+        prompt: str,
+        model: str = "dall-e-3",
+        size: str = "1024x1024",
+        quality: str = "standard",
+        n: int = 1
+    ) -> List[str]:
+        """Generate several images for one prompt without blocking the event loop
+
+        Requests that a model cannot serve in one call are sent concurrently.
+
+        Args:
+            prompt: Text description of the images to generate
+            model: Model to use (default: dall-e-3, can also use dall-e-2)
+            size: Image size (1024x1024, 1792x1024, or 1024x1792 for dall-e-3)
+            quality: Image quality (standard or hd, only for dall-e-3)
+            n: Number of images to generate
+
+        Returns:
+            URLs of the generated images
+        """
+        client = self.get_async_client()
+        limiter = get_image_rate_limiter()
+
+        async def _generate(count: int):
+            await limiter.acquire(0)
+            raw = await client.images.with_raw_response.generate(
                 model=model,
                 prompt=prompt,
                 size=size,
                 quality=quality,
-                n=n
+                n=count
             )
+            limiter.calibrate(raw.headers)
+            return raw.parse()
 
-            return response.data[0].url
+        try:
+            responses = await asyncio.gather(*(
+                _generate(count) for count in _image_request_counts(model, n)
+            ))
+
+            return [d.url for response in responses for d in response.data]
 
         except Exception as e:
-            error_str = str(e)
-            print(f"Error generating image: {error_str}")
-
-            # Provide helpful error messages
-            if "billing" in error_str.lower():
-                raise ValueError(
-                    "Image generation failed due to billing issues. "
-                    "Please check your OpenAI account has credits available."
-                ) from e
-            elif "content_policy" in error_str.lower() or "safety" in error_str.lower():
-                raise ValueError(
-                    "Image generation failed: Content policy violation. "
-                    "The prompt may contain inappropriate content."
-                ) from e
-            else:
-                raise Exception(f"Image generation error: {error_str}") from e
+            raise self._image_error(e) from e
+
+    def _image_error(self, e: Exception) -> Exception:
+        """Translate an image API exception into a more helpful error
+
+        Args:
+            e: The exception raised by the OpenAI SDK
+
+        Returns:
+            Exception to raise in place of the original
+        """
+        error_str = str(e)
+        print(f"Error generating image: {error_str}")
+
+        # Provide helpful error messages
+        if "billing" in error_str.lower():
+            return ValueError(
+                "Image generation failed due to billing issues. "
+                "Please check your OpenAI account has credits available."
+            )
+        elif "content_policy" in error_str.lower() or "safety" in error_str.lower():
+            return ValueError(
+                "Image generation failed: Content policy violation. "
+                "The prompt may contain inappropriate content."
+            )
+        else:
+            return Exception(f"Image generation error: {error_str}")
 
 
 # Singleton instance
 _client: Optional[OpenAIClient] = None
+_client_lock = threading.Lock()
+
+_T = TypeVar('_T')
+
+
+async def _run_and_close(coro: Awaitable[_T]) -> _T:
+    """Await a coroutine, then close the loop's async client"""
+    try:
+        return await coro
+    finally:
+        if _client is not None:
+            await _client.aclose_async_client()
+
+
+def run_async(coro: Awaitable[_T]) -> _T:
+    """Run a coroutine on a new event loop, like asyncio.run()
+
+    The async client created for the loop is closed before the loop ends, so
+    its sockets are released instead of left open when the loop goes away.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    return asyncio.run(_run_and_close(coro))
+
+
+def _create_client() -> OpenAIClient:
+    """Create and warm up a client, closing it when the process exits"""
+    client = OpenAIClient()
+    client.warm_up()
+    atexit.register(client.close)
+    return client
+
+
+def _load_client() -> OpenAIClient:
+    """Create the client, sharing it through st.cache_resource under Streamlit
+
+    Streamlit may re-import this module on code changes, which would reset the
+    module-level singleton; its resource cache keeps the same client (and its
+    connection pool) alive across reruns and re-imports. Scripts that never
+    loaded Streamlit don't import it.
+    """
+    st = sys.modules.get('streamlit')
+    if st is None:
+        return _create_client()
+    return st.cache_resource(show_spinner=False)(_create_client)()
 
 
 def get_openai_client() -> OpenAIClient:
-    """Get or create the OpenAI client singleton"""
+    """Get or create the OpenAI client singleton
+
+    Download and analysis workers call this from many threads, so creation is
+    locked to guarantee one client and one connection pool per process.
+    """
     global _client
 
-    if _client is None:
+    if _client is not None:
+        return _client
+
+    with _client_lock:
+        if _client is not None:
+            return _client
         try:
-            _client = OpenAIClient()
+            _client = _load_client()
         except ValueError as e:
-            # API key not set
-            st.error(str(e))
-            st.info("Please set OPENAI_API_KEY in your environment variables or .env file")
+            # API key not set; surface it in the UI when running under Streamlit.
+            # Imported here so scripts and workers don't pay for importing it
+            try:
+                import streamlit as st
+                st.error(str(e))
+                st.info("Please set OPENAI_API_KEY in your environment variables or .env file")
+            except ImportError:
+                pass
             raise
 
     return _client
@@ -273,7 +1002,9 @@ def fetch_openai_completion(
     messages: List[Dict[str, str]],
     model: Optional[str] = None,
     temperature: float = 0.7,
-    max_tokens: int = 800
+    max_tokens: int = 800,
+    response_format: Optional[Dict[str, str]] = None,
+    seed: Optional[int] = None
 ) -> str:
     """Helper function to fetch OpenAI completion
 
@@ -282,9 +1013,119 @@ def fetch_openai_completion(
         model: Model to use (defaults to gpt-4o)
         temperature: Sampling temperature
         max_tokens: Maximum tokens in response
+        response_format: Optional response format, e.g. {"type": "json_object"}
+        seed: Optional sampling seed for reproducible output
 
     Returns:
         The completion text
     """
     client = get_openai_client()
-    return client.fetch_completion(messages, model, temperature, max_tokens)
+    return client.fetch_completion(messages, model, temperature, max_tokens, response_format, seed)
+
+
+def stream_openai_completion(
+    messages: List[Dict[str, str]],
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: int = 800
+) -> Iterator[str]:
+    """Helper function to stream an OpenAI completion
+
+    Args:
+        messages: List of message dicts with 'role' and 'content'
+        model: Model to use (defaults to gpt-4o)
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens in response
+
+    Yields:
+        Pieces of the completion text as they arrive
+    """
+    client = get_openai_client()
+    yield from client.stream_completion(messages, model, temperature, max_tokens)
+
+
+def fetch_openai_embedding(text: str) -> List[float]:
+    """Helper function to embed text with the default embedding model
+
+    Args:
+        text: Text to embed
+
+    Returns:
+        The embedding vector
+    """
+    return get_openai_client().create_embedding(text)
+
+
+async def fetch_openai_completion_async(
+    messages: List[Dict[str, str]],
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: int = 800,
+    response_format: Optional[Dict[str, str]] = None,
+    seed: Optional[int] = None
+) -> str:
+    """Async helper to fetch OpenAI completion
+
+    Args:
+        messages: List of message dicts with 'role' and 'content'
+        model: Model to use (defaults to gpt-4o)
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens in response
+        response_format: Optional response format, e.g. {"type": "json_object"}
+        seed: Optional sampling seed for reproducible output
+
+    Returns:
+        The completion text
+    """
+    client = get_openai_client()
+    return await client.fetch_completion_async(messages, model, temperature, max_tokens, response_format, seed)
+
+
+def fetch_openai_json_completion(
+    messages: List[Dict[str, str]],
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: int = 800,
+    response_format: Optional[Dict[str, str]] = None
+) -> str:
+    """Helper to stream a completion until a complete JSON object arrives
+
+    Args:
+        messages: List of message dicts with 'role' and 'content'
+        model: Model to use (defaults to gpt-4o)
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens in response
+        response_format: Optional response format, e.g. {"type": "json_object"}
+
+    Returns:
+        The JSON object text, or the complete response text
+    """
+    client = get_openai_client()
+    return client.fetch_json_completion(messages, model, temperature, max_tokens, response_format)
+
+
+async def fetch_openai_json_completion_async(
+    messages: List[Dict[str, str]],
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: int = 800,
+    response_format: Optional[Dict[str, str]] = None,
+    on_text: Optional[Callable[[str], None]] = None
+) -> str:
+    """Async helper to stream a completion until a complete JSON object arrives
+
+    Args:
+        messages: List of message dicts with 'role' and 'content'
+        model: Model to use (defaults to gpt-4o)
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens in response
+        response_format: Optional response format, e.g. {"type": "json_object"}
+        on_text: Optional callback given each piece of text as it arrives
+
+    Returns:
+        The JSON object text, or the complete response text
+    """
+    client = get_openai_client()
+    return await client.fetch_json_completion_async(
+        messages, model, temperature, max_tokens, response_format, on_text
+    )
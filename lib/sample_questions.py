@@ -3,7 +3,61 @@ Sample question generator for suspect interviews.
 Provides contextual question suggestions based on suspect information.
 """
 
-from typing import List, Dict, Any
+import re
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
+
+
+# Whole words in a suspect's name that suggest their role
+_TEACHER_KWS = frozenset({'teacher', 'mr', 'ms', 'mrs', 'professor'})
+_STUDENT_KWS = frozenset({'student', 'kid', 'child'})
+_STAFF_KWS = frozenset({'janitor', 'custodian', 'guard', 'security', 'cook', 'chef'})
+
+# Maximum number of questions returned
+MAX_SAMPLE_QUESTIONS = 8
+
+# Question templates; {title} and {location} come from the case
+_BASIC_QUESTIONS: Tuple[str, ...] = (
+    "Where were you when {title} occurred?",
+    "Can you tell me about your relationship with the victim?",
+)
+_ALIBI_QUESTIONS: Tuple[str, ...] = (
+    "Can anyone verify your alibi?",
+    "What were you doing before and after the incident?",
+)
+_MOTIVE_QUESTIONS: Tuple[str, ...] = (
+    "What do you know about the incident?",
+    "Did you have any reason to be involved in this?",
+)
+_BACKGROUND_QUESTIONS: Tuple[str, ...] = (
+    "How long have you been at {location}?",
+    "Have you noticed anything unusual recently?",
+)
+
+# Specific probing questions asked of every suspect
+_STATIC_QUESTIONS: Tuple[str, ...] = (
+    "Is there anything you're not telling me?",
+    "Have you seen or heard anything suspicious?",
+    "Do you know anyone who might want this to happen?",
+    "What's your opinion about the other suspects?",
+    "Can you walk me through your activities that day?",
+)
+
+# Suspect-specific questions, keyed by the role keywords that trigger them
+_ROLE_QUESTIONS: Tuple[Tuple[frozenset, Tuple[str, ...]], ...] = (
+    (_TEACHER_KWS, (
+        "How well do you know your students?",
+        "Have you noticed any behavioral changes in anyone?",
+    )),
+    (_STUDENT_KWS, (
+        "Do you get along with your classmates?",
+        "Have you been having any problems at school?",
+    )),
+    (_STAFF_KWS, (
+        "Do you have access to all areas?",
+        "What do you usually see during your rounds?",
+    )),
+)
 
 
 def get_sample_questions_for_suspect(suspect: Dict[str, Any], case: Dict[str, Any]) -> List[str]:
@@ -17,53 +71,50 @@ def get_sample_questions_for_suspect(suspect: Dict[str, Any], case: Dict[str, An
     Returns:
         List of suggested questions to ask the suspect
     """
-    questions = []
+    return list(_sample_questions(
+        case.get('title', 'the incident'),
+        case.get('location', 'this location'),
+        suspect.get('name', ''),
+        bool(suspect.get('alibi')),
+        bool(suspect.get('motive')),
+        bool(suspect.get('background'))
+    ))
 
-    # Basic questions
-    questions.append(f"Where were you when {case.get('title', 'the incident')} occurred?")
-    questions.append("Can you tell me about your relationship with the victim?")
 
-    # Questions based on alibi
-    if suspect.get('alibi'):
-        questions.append("Can anyone verify your alibi?")
-        questions.append("What were you doing before and after the incident?")
-
-    # Questions based on motive
-    if suspect.get('motive'):
-        questions.append("What do you know about the incident?")
-        questions.append("Did you have any reason to be involved in this?")
-
-    # Questions based on background
-    if suspect.get('background'):
-        questions.append(f"How long have you been at {case.get('location', 'this location')}?")
-        questions.append("Have you noticed anything unusual recently?")
-
-    # Specific probing questions
-    questions.extend([
-        "Is there anything you're not telling me?",
-        "Have you seen or heard anything suspicious?",
-        "Do you know anyone who might want this to happen?",
-        "What's your opinion about the other suspects?",
-        "Can you walk me through your activities that day?"
-    ])
+@lru_cache(maxsize=256)
+def _sample_questions(
+    title: str,
+    location: str,
+    name: str,
+    has_alibi: bool,
+    has_motive: bool,
+    has_background: bool
+) -> Tuple[str, ...]:
+    """Build the sample questions from the hashable parts of a suspect and case"""
+    templates = list(_BASIC_QUESTIONS)
+    if has_alibi:
+        templates.extend(_ALIBI_QUESTIONS)
+    if has_motive:
+        templates.extend(_MOTIVE_QUESTIONS)
+    if has_background:
+        templates.extend(_BACKGROUND_QUESTIONS)
+    templates.extend(_STATIC_QUESTIONS)
 
     # Add suspect-specific questions based on name/role
-    name = suspect.get('name', '').lower()
-
-    # Teacher-specific
-    if any(word in name for word in ['teacher', 'mr.', 'ms.', 'mrs.', 'professor']):
-        questions.append("How well do you know your students?")
-        questions.append("Have you noticed any behavioral changes in anyone?")
-
-    # Student-specific
-    if any(word in name for word in ['student', 'kid', 'child']):
-        questions.append("Do you get along with your classmates?")
-        questions.append("Have you been having any problems at school?")
-
-    # Staff-specific
-    if any(word in name for word in ['janitor', 'custodian', 'guard', 'security', 'cook', 'chef']):
-        questions.append("Do you have access to all areas?")
-        questions.append("What do you usually see during your rounds?")
+    name_tokens = set(re.findall(r"[a-z]+", name.lower()))
+    for keywords, role_questions in _ROLE_QUESTIONS:
+        if keywords & name_tokens:
+            templates.extend(role_questions)
 
-    # Return unique questions (in case of duplicates)
-    return list(dict.fromkeys(questions))[:8]  # Limit to 8 questions
+    # Return unique questions (in case of duplicates), stopping at the limit
+    fields = {'title': title, 'location': location}
+    unique = []
+    seen = set()
+    for template in templates:
+        question = template.format_map(fields)
+        if question not in seen:
+            seen.add(question)
+            unique.append(question)
+            if len(unique) == MAX_SAMPLE_QUESTIONS:
+                break
+    return tuple(unique)
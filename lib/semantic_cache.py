@@ -0,0 +1,89 @@
+"""Embedding-based cache for answers to rephrased questions"""
+
+import threading
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Cosine similarity above which two questions count as the same question
+SIMILARITY_THRESHOLD = 0.92
+
+# Answers kept per key; the oldest are evicted first
+MAX_ENTRIES_PER_KEY = 64
+
+
+class SemanticCache:
+    """Per-key store of (question embedding, answer) pairs
+
+    Embeddings for a key are kept as rows of one unit-normalized matrix, so a
+    lookup is a single matrix-vector product rather than a Python loop.
+    """
+
+    def __init__(
+        self,
+        threshold: float = SIMILARITY_THRESHOLD,
+        max_entries: int = MAX_ENTRIES_PER_KEY
+    ):
+        """Initialize an empty cache
+
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Answers kept per key
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[np.ndarray, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Optional[np.ndarray]:
+        """Convert an embedding to a unit vector, or None if it is all zeros"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def lookup(self, key: Hashable, embedding: Sequence[float]) -> Optional[str]:
+        """Find the answer to the most similar earlier question
+
+        Args:
+            key: Cache partition, e.g. the suspect being asked
+            embedding: Embedding of the new question
+
+        Returns:
+            The cached answer if the best match clears the threshold, else None
+        """
+        query = self._normalize(embedding)
+        if query is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            matrix, answers = entry
+            similarities = matrix @ query
+
+        best = int(np.argmax(similarities))
+        return answers[best] if similarities[best] >= self.threshold else None
+
+    def add(self, key: Hashable, embedding: Sequence[float], answer: str):
+        """Remember the answer to a question
+
+        Args:
+            key: Cache partition, e.g. the suspect being asked
+            embedding: Embedding of the question
+            answer: The answer to return for similar questions
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                matrix, answers = vector[np.newaxis, :], [answer]
+            else:
+                matrix = np.vstack((entry[0], vector))[-self.max_entries:]
+                answers = (entry[1] + [answer])[-self.max_entries:]
+            self._entries[key] = (matrix, answers)
@@ -1,10 +1,73 @@
 """Suspect analysis and interview using OpenAI"""
 
-import json
-import re
-from typing import List, Dict, Any, Optional
+import asyncio
+import os
+import textwrap
+from collections import Counter
+from typing import Iterator, List, Dict, Any, Optional
 from lib.types import Suspect, Clue, Case, Interview, SuspectAnalysis, SuspectAnalysisConnection
-from lib.openai_client import fetch_openai_completion
+from lib.llm_json import parse_json
+from lib.openai_client import (
+    fetch_openai_completion,
+    fetch_openai_completion_async,
+    fetch_openai_embedding,
+    fetch_openai_json_completion,
+    run_async,
+    stream_openai_completion
+)
+from lib.semantic_cache import SemanticCache
+
+try:
+    from rapidfuzz import fuzz, process, utils as fuzz_utils
+except ImportError:  # Fall back to substring matching
+    process = None
+
+
+# Ask the API for a guaranteed-parseable JSON object (models without JSON
+# mode fall back to the tolerant parse_json extraction)
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Analyses are sampled deterministically so repeats are served from the
+# response cache and reruns show the same result
+ANALYSIS_TEMPERATURE = 0.0
+ANALYSIS_SEED = 0xDE7EC71
+
+# Upper bound on concurrent analysis requests for one case
+MAX_CONCURRENT_ANALYSES = 8
+
+# Output format for analyzing every suspect of a case in one request
+SUSPECTS_BATCH_FORMAT = """Analyze EACH suspect above. Respond with a JSON object in this exact shape:
+{"suspects": [{"suspectId": "<id from the list>", "trustworthiness": 0-100,
+"inconsistencies": ["..."], "connections": [{"clue": "<clue title>", "type": "...", "description": "..."}],
+"suggestedQuestions": ["..."]}]}
+Include one entry per suspect."""
+
+# Response tokens budgeted per suspect in a batched analysis
+BATCH_TOKENS_PER_SUSPECT = 600
+
+# Minimum token-set similarity (0-100) for a connection to match a clue title
+CLUE_MATCH_CUTOFF = 70
+
+# Cases with at least this many clues narrow matches with a title trigram index
+TRIGRAM_INDEX_MIN_CLUES = 8
+
+# Clues sharing the most trigrams with a title that are scored in full
+TRIGRAM_CANDIDATES = 3
+
+# Clue descriptions are shortened to this many characters in prompts
+CLUE_DESCRIPTION_CHARS = 280
+
+# Earlier Q&A pairs sent with each interview question
+MAX_INTERVIEW_HISTORY = 6
+
+# Interview answers are 2-3 short sentences
+INTERVIEW_MAX_TOKENS = 400
+
+# Short child-level answers don't need the default model
+INTERVIEW_MODEL = os.getenv('OPENAI_INTERVIEW_MODEL', 'gpt-4o-mini')
+
+# Earlier interview answers per suspect, reused when a question is rephrased
+_interview_cache = SemanticCache()
 
 
 # System prompts for suspect analysis
@@ -46,6 +109,252 @@ def analyze_suspect(
     Returns:
         SuspectAnalysis with trustworthiness, inconsistencies, etc.
     """
+    messages = build_suspect_messages(suspect, clues, case_data, interview, language)
+
+    try:
+        # Call OpenAI API
+        response = fetch_openai_completion(
+            messages,
+            temperature=ANALYSIS_TEMPERATURE,
+            max_tokens=2048,
+            response_format=JSON_RESPONSE_FORMAT,
+            seed=ANALYSIS_SEED
+        )
+
+        # Parse JSON response
+        parsed_data = parse_json_response(response)
+
+        # Format the analysis
+        return format_suspect_analysis(parsed_data, clues, suspect.id)
+
+    except Exception as e:
+        print(f"Suspect analysis error: {e}")
+        return create_fallback_analysis(suspect.id)
+
+
+async def analyze_suspect_async(
+    suspect: Suspect,
+    clues: List[Clue],
+    case_data: Case,
+    interview: Optional[Interview] = None,
+    language: str = 'en'
+) -> SuspectAnalysis:
+    """Analyze a suspect without blocking the event loop
+
+    Args:
+        suspect: The suspect to analyze
+        clues: List of discovered clues
+        case_data: The case information
+        interview: Optional interview data
+        language: Language code
+
+    Returns:
+        SuspectAnalysis with trustworthiness, inconsistencies, etc.
+    """
+    messages = build_suspect_messages(suspect, clues, case_data, interview, language)
+
+    try:
+        response = await fetch_openai_completion_async(
+            messages,
+            temperature=ANALYSIS_TEMPERATURE,
+            max_tokens=2048,
+            response_format=JSON_RESPONSE_FORMAT,
+            seed=ANALYSIS_SEED
+        )
+        return format_suspect_analysis(parse_json_response(response), clues, suspect.id)
+
+    except Exception as e:
+        print(f"Suspect analysis error: {e}")
+        return create_fallback_analysis(suspect.id)
+
+
+async def analyze_suspects_async(
+    suspects: List[Suspect],
+    clues: List[Clue],
+    case_data: Case,
+    interviews: Optional[Dict[str, Interview]] = None,
+    language: str = 'en'
+) -> List[SuspectAnalysis]:
+    """Analyze several suspects concurrently
+
+    Args:
+        suspects: The suspects to analyze
+        clues: List of discovered clues
+        case_data: The case information
+        interviews: Optional interview data keyed by suspect ID
+        language: Language code
+
+    Returns:
+        List of SuspectAnalysis, in the same order as suspects
+    """
+    interviews = interviews or {}
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
+
+    async def _analyze(suspect: Suspect) -> SuspectAnalysis:
+        async with semaphore:
+            return await analyze_suspect_async(
+                suspect, clues, case_data, interviews.get(suspect.id), language
+            )
+
+    return await asyncio.gather(*(_analyze(s) for s in suspects))
+
+
+def analyze_suspects(
+    suspects: List[Suspect],
+    clues: List[Clue],
+    case_data: Case,
+    interviews: Optional[Dict[str, Interview]] = None,
+    language: str = 'en'
+) -> List[SuspectAnalysis]:
+    """Analyze several suspects concurrently from synchronous code
+
+    Args:
+        suspects: The suspects to analyze
+        clues: List of discovered clues
+        case_data: The case information
+        interviews: Optional interview data keyed by suspect ID
+        language: Language code
+
+    Returns:
+        List of SuspectAnalysis, in the same order as suspects
+    """
+    return run_async(analyze_suspects_async(suspects, clues, case_data, interviews, language))
+
+
+def analyze_suspects_batch(
+    suspects: List[Suspect],
+    clues: List[Clue],
+    case_data: Case,
+    language: str = 'en'
+) -> List[SuspectAnalysis]:
+    """Analyze all suspects of a case with a single request
+
+    The case and clue context is sent once instead of once per suspect.
+    Suspects missing from the batched answer are analyzed individually.
+
+    Args:
+        suspects: The suspects to analyze
+        clues: List of discovered clues
+        case_data: The case information
+        language: Language code
+
+    Returns:
+        List of SuspectAnalysis, in the same order as suspects
+    """
+    if not suspects:
+        return []
+
+    messages = build_suspects_batch_messages(suspects, clues, case_data, language)
+    entries = {}
+
+    try:
+        response = fetch_openai_json_completion(
+            messages,
+            temperature=ANALYSIS_TEMPERATURE,
+            max_tokens=BATCH_TOKENS_PER_SUSPECT * len(suspects),
+            response_format=JSON_RESPONSE_FORMAT
+        )
+        for entry in parse_json(response).get('suspects') or []:
+            if isinstance(entry, dict):
+                entries[str(entry.get('suspectId'))] = entry
+    except Exception as e:
+        print(f"Batched suspect analysis error: {e}")
+
+    analyses = {
+        suspect.id: format_suspect_analysis(entries[suspect.id], clues, suspect.id)
+        for suspect in suspects
+        if suspect.id in entries
+    }
+
+    missing = [suspect for suspect in suspects if suspect.id not in analyses]
+    if missing:
+        for suspect, analysis in zip(missing, analyze_suspects(missing, clues, case_data, language=language)):
+            analyses[suspect.id] = analysis
+
+    return [analyses[suspect.id] for suspect in suspects]
+
+
+def format_clue_context(clues: List[Clue]) -> str:
+    """Format the discovered clues for a prompt, one per line
+
+    Undiscovered clues are left out (unless none are discovered yet) and
+    long descriptions are shortened to keep the prompt small.
+
+    Args:
+        clues: List of clues
+
+    Returns:
+        Newline-separated "title: description" lines
+    """
+    discovered = [c for c in clues if c.discovered] or clues
+    return "\n".join(
+        f"{c.title}: {textwrap.shorten(c.description, CLUE_DESCRIPTION_CHARS, placeholder='...')}"
+        for c in discovered
+    )
+
+
+def build_suspects_batch_messages(
+    suspects: List[Suspect],
+    clues: List[Clue],
+    case_data: Case,
+    language: str = 'en'
+) -> List[Dict[str, str]]:
+    """Build the chat messages for analyzing several suspects at once
+
+    Args:
+        suspects: The suspects to analyze
+        clues: List of discovered clues
+        case_data: The case information
+        language: Language code
+
+    Returns:
+        List of message dicts with 'role' and 'content'
+    """
+    system_prompt = SUSPECT_ANALYSIS_PROMPT_TH if language == 'th' else SUSPECT_ANALYSIS_PROMPT_EN
+
+    suspect_text = "\n".join(
+        f"- ID: {s.id}\n  Name: {s.name}\n  Description: {s.description}\n"
+        f"  Background: {s.background}\n  Alibi: {s.alibi}"
+        for s in suspects
+    )
+
+    user_prompt = f"""Case Information:
+Title: {case_data.title}
+Summary: {case_data.summary}
+
+Discovered Clues:
+{format_clue_context(clues)}
+
+Suspects to Analyze:
+{suspect_text}
+
+{SUSPECTS_BATCH_FORMAT}"""
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def build_suspect_messages(
+    suspect: Suspect,
+    clues: List[Clue],
+    case_data: Case,
+    interview: Optional[Interview] = None,
+    language: str = 'en'
+) -> List[Dict[str, str]]:
+    """Build the chat messages for a suspect analysis request
+
+    Args:
+        suspect: The suspect to analyze
+        clues: List of discovered clues
+        case_data: The case information
+        interview: Optional interview data
+        language: Language code
+
+    Returns:
+        List of message dicts with 'role' and 'content'
+    """
     # Choose prompt based on language
     system_prompt = SUSPECT_ANALYSIS_PROMPT_TH if language == 'th' else SUSPECT_ANALYSIS_PROMPT_EN
 
@@ -62,7 +371,7 @@ def analyze_suspect(
 ข้ออ้าง: {suspect.alibi}
 
 หลักฐาน:
-{chr(10).join([f'{c.title}: {c.description}' for c in clues])}
+{format_clue_context(clues)}
 
 กรุณาวิเคราะห์ผู้ต้องสงสัย"""
     else:
@@ -77,46 +386,32 @@ Background: {suspect.background}
 Alibi: {suspect.alibi}
 
 Discovered Clues:
-{chr(10).join([f'{c.title}: {c.description}' for c in clues])}
+{format_clue_context(clues)}
 
 Please analyze this suspect."""
 
     # Add interview data if available
     if interview and any(q.asked for q in interview.questions):
-        asked_questions = [q for q in interview.questions if q.asked]
-        interview_text = chr(10).join([f"Q: {q.question}\nA: {q.answer}" for q in asked_questions])
+        interview_text = "\n".join(
+            f"Q: {q.question}\nA: {q.answer}" for q in interview.questions if q.asked
+        )
         user_prompt += f"\n\nInterview Records:\n{interview_text}"
 
-    # Prepare messages
-    messages = [
+    return [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_prompt}
     ]
 
-    try:
-        # Call OpenAI API
-        response = fetch_openai_completion(
-            messages,
-            temperature=0.7,
-            max_tokens=2048
-        )
-
-        # Parse JSON response
-        parsed_data = parse_json_response(response)
-
-        # Format the analysis
-        return format_suspect_analysis(parsed_data, clues, suspect.id)
 
-    except Exception as e:
-        print(f"Suspect analysis error: {e}")
-        # Return fallback analysis
-        return SuspectAnalysis(
-            suspectId=suspect.id,
-            trustworthiness=50,
-            inconsistencies=[],
-            connections=[],
-            suggestedQuestions=["What were you doing?", "Did you see anything?"]
-        )
+def create_fallback_analysis(suspect_id: str) -> SuspectAnalysis:
+    """Create a fallback analysis if the API call fails"""
+    return SuspectAnalysis(
+        suspectId=suspect_id,
+        trustworthiness=50,
+        inconsistencies=[],
+        connections=[],
+        suggestedQuestions=["What were you doing?", "Did you see anything?"]
+    )
 
 
 def process_interview_question(
@@ -125,7 +420,8 @@ def process_interview_question(
     clues: List[Clue],
     case_data: Case,
     previous_questions: List[Dict[str, str]],
-    language: str = 'en'
+    language: str = 'en',
+    model: Optional[str] = None
 ) -> str:
     """Process an interview question and generate a response
 
@@ -136,10 +432,90 @@ def process_interview_question(
         case_data: Case information
         previous_questions: Previous Q&A pairs
         language: Language code
+        model: Model to use (defaults to INTERVIEW_MODEL)
 
     Returns:
         The suspect's answer
     """
+    return "".join(stream_interview_answer(
+        question, suspect, clues, case_data, previous_questions, language, model
+    ))
+
+
+def stream_interview_answer(
+    question: str,
+    suspect: Suspect,
+    clues: List[Clue],
+    case_data: Case,
+    previous_questions: List[Dict[str, str]],
+    language: str = 'en',
+    model: Optional[str] = None
+) -> Iterator[str]:
+    """Stream the suspect's answer to an interview question as it is generated
+
+    Args:
+        question: The question to ask
+        suspect: The suspect being interviewed
+        clues: List of clues
+        case_data: Case information
+        previous_questions: Previous Q&A pairs
+        language: Language code
+        model: Model to use (defaults to INTERVIEW_MODEL)
+
+    Yields:
+        Pieces of the suspect's answer
+    """
+    messages = build_interview_messages(question, suspect, case_data, previous_questions, language)
+
+    # Reuse the answer to an earlier, similarly worded question
+    cache_key = (case_data.id, suspect.id, language)
+    try:
+        embedding = fetch_openai_embedding(question)
+    except Exception as e:
+        print(f"Question embedding error: {e}")
+        embedding = None
+
+    if embedding is not None:
+        cached = _interview_cache.lookup(cache_key, embedding)
+        if cached is not None:
+            yield cached
+            return
+
+    # Get response
+    parts = []
+    for piece in stream_openai_completion(
+        messages,
+        model=model or INTERVIEW_MODEL,
+        temperature=0.7,
+        max_tokens=INTERVIEW_MAX_TOKENS
+    ):
+        parts.append(piece)
+        yield piece
+
+    answer = "".join(parts)
+    if embedding is not None and answer:
+        _interview_cache.add(cache_key, embedding, answer)
+
+
+def build_interview_messages(
+    question: str,
+    suspect: Suspect,
+    case_data: Case,
+    previous_questions: List[Dict[str, str]],
+    language: str = 'en'
+) -> List[Dict[str, str]]:
+    """Build the chat messages for an interview question
+
+    Args:
+        question: The question to ask
+        suspect: The suspect being interviewed
+        case_data: Case information
+        previous_questions: Previous Q&A pairs
+        language: Language code
+
+    Returns:
+        List of message dicts with 'role' and 'content'
+    """
     # Create system prompt for the suspect's character
     if language == 'th':
         system_prompt = f"""คุณเป็น {suspect.name} ในเรื่อง "{case_data.title}"
@@ -172,43 +548,98 @@ Keep your answer to 2-3 sentences only."""
     # Prepare messages with conversation history
     messages = [{"role": "system", "content": system_prompt}]
 
-    # Add previous Q&A
-    for prev_q in previous_questions:
+    # Add the most recent Q&A
+    for prev_q in previous_questions[-MAX_INTERVIEW_HISTORY:]:
         messages.append({"role": "user", "content": prev_q['question']})
         messages.append({"role": "assistant", "content": prev_q['answer']})
 
     # Add current question
     messages.append({"role": "user", "content": question})
-
-    # Get response
-    response = fetch_openai_completion(
-        messages,
-        temperature=0.7,
-        max_tokens=2048
-    )
-
-    return response
+    return messages
 
 
 def parse_json_response(response: str) -> Dict[str, Any]:
     """Parse JSON from OpenAI response"""
-    json_match = (
-        re.search(r'```json\n([\s\S]*?)\n```', response) or
-        re.search(r'```([\s\S]*?)```', response) or
-        re.search(r'({[\s\S]*})', response)
-    )
+    return parse_json(response, fallback={
+        "trustworthiness": 50,
+        "inconsistencies": [],
+        "connections": [],
+        "suggestedQuestions": []
+    })
 
-    json_content = json_match.group(1) if json_match else response
 
-    try:
-        return json.loads(json_content)
-    except json.JSONDecodeError:
-        return {
-            "trustworthiness": 50,
-            "inconsistencies": [],
-            "connections": [],
-            "suggestedQuestions": []
-        }
+def _trigrams(text: str) -> set:
+    """Character trigrams of a lowercased title, padded so short words count"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def build_trigram_index(clue_titles: List[str]) -> Dict[str, List[int]]:
+    """Map each trigram of the clue titles to the positions of titles containing it
+
+    Args:
+        clue_titles: Lowercased clue titles
+
+    Returns:
+        Dict of trigram to list of indexes into clue_titles
+    """
+    index: Dict[str, List[int]] = {}
+    for i, clue_title in enumerate(clue_titles):
+        for gram in _trigrams(clue_title):
+            index.setdefault(gram, []).append(i)
+    return index
+
+
+def match_clue(
+    title: str,
+    clues: List[Clue],
+    clue_titles: List[str],
+    trigram_index: Optional[Dict[str, List[int]]] = None
+) -> Optional[Clue]:
+    """Find the clue a model-written title refers to
+
+    Uses RapidFuzz token-set similarity when installed, so reordered or
+    reworded titles ("vase, broken" vs "Broken Vase") still match; otherwise
+    falls back to case-insensitive substring matching. With a trigram index,
+    only the few clues sharing the most trigrams with the title are scored.
+
+    Args:
+        title: Clue title as written by the model
+        clues: Candidate clues
+        clue_titles: Lowercased titles of clues, in the same order
+        trigram_index: Optional index from build_trigram_index(clue_titles)
+
+    Returns:
+        The matching clue, or None
+    """
+    if not title or not clues:
+        return None
+
+    if trigram_index is not None:
+        counts = Counter()
+        for gram in _trigrams(title.lower()):
+            counts.update(trigram_index.get(gram, ()))
+        candidates = [i for i, _ in counts.most_common(TRIGRAM_CANDIDATES)]
+        if not candidates:
+            return None
+        clues = [clues[i] for i in candidates]
+        clue_titles = [clue_titles[i] for i in candidates]
+
+    if process is not None:
+        match = process.extractOne(
+            title,
+            clue_titles,
+            scorer=fuzz.token_set_ratio,
+            processor=fuzz_utils.default_process,
+            score_cutoff=CLUE_MATCH_CUTOFF
+        )
+        return clues[match[2]] if match else None
+
+    title = title.lower()
+    return next(
+        (c for c, clue_title in zip(clues, clue_titles) if clue_title in title or title in clue_title),
+        None
+    )
 
 
 def format_suspect_analysis(
@@ -237,14 +668,15 @@ def format_suspect_analysis(
     connections_data = data.get('connections', [])
 
     if isinstance(connections_data, list):
+        # Lowercase each clue title once rather than once per connection
+        clue_titles = [c.title.lower() for c in clues]
+        trigram_index = build_trigram_index(clue_titles) if len(clues) >= TRIGRAM_INDEX_MIN_CLUES else None
+
         for conn in connections_data:
             clue_title = conn.get('clue', conn.get('clueTitle', ''))
 
             # Find matching clue
-            matched_clue = next(
-                (c for c in clues if c.title.lower() in clue_title.lower() or clue_title.lower() in c.title.lower()),
-                None
-            )
+            matched_clue = match_clue(clue_title, clues, clue_titles, trigram_index)
 
             if matched_clue:
                 connections.append(SuspectAnalysisConnection(
@@ -1,12 +1,19 @@
 """Type definitions for the Emerson Detective Game"""
 
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 import uuid
 
 
-@dataclass
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    """Names of a dataclass's fields, computed once per class"""
+    return tuple(f.name for f in fields(cls))
+
+
+@dataclass(slots=True)
 class Case:
     """Represents a detective case"""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -20,8 +27,28 @@ class Case:
     imageUrl: str = "/case-file.png"
     isLLMGenerated: bool = False
 
-
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the fields (no recursive copy like dataclasses.asdict)"""
+        return {name: getattr(self, name) for name in _field_names(type(self))}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Case":
+        """Build a Case from a dict, ignoring unknown keys"""
+        return cls(
+            id=d.get('id') or str(uuid.uuid4()),
+            title=d.get('title', ''),
+            description=d.get('description', ''),
+            summary=d.get('summary') or '',
+            difficulty=d.get('difficulty') or 'medium',
+            solved=bool(d.get('solved', False)),
+            location=d.get('location') or '',
+            dateTime=d.get('dateTime') or datetime.now().isoformat(),
+            imageUrl=d.get('imageUrl') or '/case-file.png',
+            isLLMGenerated=bool(d.get('isLLMGenerated', False))
+        )
+
+
+@dataclass(slots=True)
 class Clue:
     """Represents a clue in a case"""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -36,8 +63,29 @@ class Clue:
     emoji: str = "🔍"
     imageUrl: Optional[str] = None
 
-
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the fields (no recursive copy like dataclasses.asdict)"""
+        return {name: getattr(self, name) for name in _field_names(type(self))}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Clue":
+        """Build a Clue from a dict, ignoring unknown keys"""
+        return cls(
+            id=d.get('id') or str(uuid.uuid4()),
+            caseId=d.get('caseId', ''),
+            title=d.get('title', ''),
+            description=d.get('description', ''),
+            location=d.get('location') or '',
+            type=d.get('type') or 'physical',
+            discovered=bool(d.get('discovered', False)),
+            examined=bool(d.get('examined', False)),
+            relevance=d.get('relevance') or 'important',
+            emoji=d.get('emoji') or '🔍',
+            imageUrl=d.get('imageUrl')
+        )
+
+
+@dataclass(slots=True)
 class Suspect:
     """Represents a suspect in a case"""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -52,8 +100,29 @@ class Suspect:
     emoji: str = "👤"
     imageUrl: Optional[str] = None
 
-
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the fields (no recursive copy like dataclasses.asdict)"""
+        return {name: getattr(self, name) for name in _field_names(type(self))}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Suspect":
+        """Build a Suspect from a dict, ignoring unknown keys"""
+        return cls(
+            id=d.get('id') or str(uuid.uuid4()),
+            caseId=d.get('caseId', ''),
+            name=d.get('name', ''),
+            description=d.get('description', ''),
+            background=d.get('background') or '',
+            motive=d.get('motive') or '',
+            alibi=d.get('alibi') or '',
+            isGuilty=bool(d.get('isGuilty', False)),
+            interviewed=bool(d.get('interviewed', False)),
+            emoji=d.get('emoji') or '👤',
+            imageUrl=d.get('imageUrl')
+        )
+
+
+@dataclass(slots=True)
 class InterviewQuestion:
     """Represents an interview question and answer"""
     question: str
@@ -61,14 +130,14 @@ class InterviewQuestion:
     asked: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class Interview:
     """Represents an interview with a suspect"""
     suspectId: str
     questions: List[InterviewQuestion] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ClueAnalysisConnection:
     """Connection between a clue and a suspect"""
     suspectId: str
@@ -76,7 +145,7 @@ class ClueAnalysisConnection:
     description: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ClueAnalysis:
     """Analysis of a clue"""
     summary: str
@@ -84,7 +153,7 @@ class ClueAnalysis:
     nextSteps: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class SuspectAnalysisConnection:
     """Connection between a suspect and a clue"""
     clueId: str
@@ -92,7 +161,7 @@ class SuspectAnalysisConnection:
     description: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SuspectAnalysis:
     """Analysis of a suspect"""
     suspectId: str
@@ -102,7 +171,7 @@ class SuspectAnalysis:
     suggestedQuestions: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class CaseSolution:
     """Solution to a case"""
     solved: bool
@@ -112,7 +181,7 @@ class CaseSolution:
     narrative: str
 
 
-@dataclass
+@dataclass(slots=True)
 class GeneratedCase:
     """A complete generated case with clues and suspects"""
     case: Case
@@ -120,10 +189,21 @@ class GeneratedCase:
     suspects: List[Suspect]
     solution: str
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Dict in the shape save_case expects, marked as a new LLM case"""
+        case_dict = self.case.to_dict()
+        case_dict.update(solved=False, archived=False, isLLMGenerated=True)
+        return {
+            'case': case_dict,
+            'clues': [c.to_dict() for c in self.clues],
+            'suspects': [s.to_dict() for s in self.suspects],
+            'solution': self.solution
+        }
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CaseGenerationParams:
-    """Parameters for case generation"""
+    """Parameters for case generation (frozen so it can key the case cache)"""
     difficulty: str = "easy"
     theme: str = "random"
     location: str = ""
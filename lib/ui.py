@@ -0,0 +1,70 @@
+"""Styling shared by the app's pages"""
+
+import streamlit as st
+
+
+# Fonts, palette, cards, buttons and sidebar used by every page
+BASE_CSS = """
+    @import url('https://fonts.googleapis.com/css2?family=Bangers&family=Comic+Neue:wght@400;700&display=swap');
+
+    :root {
+        --primary-color: #FF6B35;
+        --secondary-color: #F7931E;
+        --accent-color: #FDC830;
+        --bg-light: #FFF9F0;
+    }
+
+    .main {
+        background-color: var(--bg-light);
+    }
+
+    .detective-card {
+        background: linear-gradient(135deg, #FFFFFF 0%, #FFF9F0 100%);
+        border: 4px solid var(--primary-color);
+        border-radius: 15px;
+        padding: 1.5rem;
+        margin: 1rem 0;
+        box-shadow: 5px 5px 0px var(--secondary-color);
+        color: #2C3E50;
+    }
+
+    .stButton>button {
+        background: linear-gradient(135deg, var(--primary-color) 0%, var(--secondary-color) 100%);
+        color: white;
+        font-family: 'Comic Neue', cursive;
+        font-weight: bold;
+        border: 3px solid #2C3E50;
+        border-radius: 10px;
+        padding: 0.5rem 1.5rem;
+        box-shadow: 3px 3px 0px #2C3E50;
+    }
+
+    /* Sidebar styling for better contrast */
+    [data-testid="stSidebar"] {
+        background: linear-gradient(180deg, #FFF9F0 0%, #FFE8CC 100%);
+        border-right: 4px solid var(--primary-color);
+    }
+
+    [data-testid="stSidebar"] a,
+    [data-testid="stSidebar"] [data-testid="stPageLink-NavLink"],
+    [data-testid="stSidebar"] [role="link"],
+    [data-testid="stSidebar"] p,
+    [data-testid="stSidebar"] span,
+    [data-testid="stSidebar"] label {
+        color: #2C3E50 !important;
+        font-weight: bold !important;
+    }
+
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    header {visibility: hidden;}
+"""
+
+
+def load_custom_css(extra_css: str = ""):
+    """Load the shared page CSS
+
+    Args:
+        extra_css: Page-specific rules, applied after the shared ones
+    """
+    st.markdown(f"<style>{BASE_CSS}{extra_css}</style>", unsafe_allow_html=True)
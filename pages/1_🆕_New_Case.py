@@ -2,11 +2,18 @@
 
 import streamlit as st
 import html
-from lib.case_generator import generate_case
+import time
+from lib.jobs import enqueue_case_generation, get_job_status, get_job_progress, pop_job_result, cancel_job
 from lib.types import CaseGenerationParams
 from lib.database import save_case, get_image_data
-from lib.image_generator import get_image_data_uri
-from dataclasses import asdict
+from lib.ui import load_custom_css
+
+
+# Rough duration of a case generation with artwork, used to pace the progress bar
+EXPECTED_GENERATION_SECONDS = 90
+
+# Seconds between status checks while a case is being generated
+GENERATION_POLL_INTERVAL = 2
 
 
 # Page configuration
@@ -17,42 +24,10 @@ st.set_page_config(
 )
 
 
-def load_custom_css():
-    """Load the custom CSS (same as main app)"""
-    st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Bangers&family=Comic+Neue:wght@400;700&display=swap');
-
-    :root {
-        --primary-color: #FF6B35;
-        --secondary-color: #F7931E;
-        --accent-color: #FDC830;
-        --bg-light: #FFF9F0;
-    }
-
-    .main {
-        background-color: var(--bg-light);
-    }
-
-    .detective-card {
-        background: linear-gradient(135deg, #FFFFFF 0%, #FFF9F0 100%);
-        border: 4px solid var(--primary-color);
-        border-radius: 15px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        box-shadow: 5px 5px 0px var(--secondary-color);
-        color: #2C3E50;
-    }
-
+# Page-specific rules added to the shared styles
+PAGE_CSS = """
     .stButton>button {
-        background: linear-gradient(135deg, var(--primary-color) 0%, var(--secondary-color) 100%);
-        color: white;
-        font-family: 'Comic Neue', cursive;
-        font-weight: bold;
-        border: 3px solid #2C3E50;
-        border-radius: 10px;
         padding: 0.75rem 1.5rem;
-        box-shadow: 3px 3px 0px #2C3E50;
     }
 
     img {
@@ -60,32 +35,11 @@ def load_custom_css():
         border: 4px solid var(--primary-color);
         box-shadow: 5px 5px 0px var(--secondary-color);
     }
-
-    /* Sidebar styling for better contrast */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #FFF9F0 0%, #FFE8CC 100%);
-        border-right: 4px solid var(--primary-color);
-    }
-
-    [data-testid="stSidebar"] a,
-    [data-testid="stSidebar"] [data-testid="stPageLink-NavLink"],
-    [data-testid="stSidebar"] [role="link"],
-    [data-testid="stSidebar"] p,
-    [data-testid="stSidebar"] span,
-    [data-testid="stSidebar"] label {
-        color: #2C3E50 !important;
-        font-weight: bold !important;
-    }
-
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    </style>
-    """, unsafe_allow_html=True)
+"""
 
 
 # Load custom CSS
-load_custom_css()
+load_custom_css(PAGE_CSS)
 
 
 # Header
@@ -105,9 +59,38 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+@st.fragment(run_every=GENERATION_POLL_INTERVAL)
+def show_generation_progress():
+    """Show the pending job's progress, rerunning only this fragment
+
+    The form, styles and tips stay as they are while the job runs; once it
+    is done, a full rerun saves and shows the new case.
+    """
+    job_id = st.session_state.pending_job_id
+    status = get_job_status(job_id) if job_id else 'unknown'
+    if status not in ('queued', 'started'):
+        st.rerun()
+
+    elapsed = time.monotonic() - st.session_state.pending_job_started
+    progress = get_job_progress(job_id)
+    if status == 'queued':
+        step = "⏳ Waiting for a free mystery writer..."
+    elif progress.get('stage') == 'images':
+        step = "🎨 Step 2/3: Creating AI artwork (this may take 1-2 minutes)..."
+    else:
+        step = "📝 Step 1/3: Generating mystery story..."
+    st.progress(min(elapsed / EXPECTED_GENERATION_SECONDS, 0.95), text=step)
+
+    # The title streams in well before the rest of the case is ready
+    if progress.get('title'):
+        st.markdown(f"#### 📋 {progress['title']}")
+
+
 # Initialize session state
 if 'just_generated_case' not in st.session_state:
     st.session_state.just_generated_case = None
+if 'pending_job_id' not in st.session_state:
+    st.session_state.pending_job_id = None
 
 
 # Case generation form
@@ -168,50 +151,47 @@ with st.form("new_case_form"):
     submitted = st.form_submit_button("🎲 Generate Mystery", use_container_width=True, type="primary")
 
 
-# Handle form submission
+# Handle form submission: queue generation in the background and keep only
+# the job id, so the script run ends right away and a fragment polls the job
 if submitted:
-    with st.spinner("🔮 Creating your mystery with AI..."):
+    # Create generation parameters
+    params = CaseGenerationParams(
+        difficulty=difficulty,
+        theme=theme if theme != "random" else "",
+        location=location,
+        era=time_of_day if time_of_day != "random" else "",
+        language=language,
+        custom_scenario=custom_scenario.strip() if custom_scenario else ""
+    )
+
+    # A new submission supersedes any earlier job; its result is discarded
+    if st.session_state.pending_job_id:
+        cancel_job(st.session_state.pending_job_id)
+
+    st.session_state.pending_job_id = enqueue_case_generation(params, generate_images=True)
+    st.session_state.pending_job_started = time.monotonic()
+    st.session_state.just_generated_case = None
+
+
+# Show progress until the pending job finishes, then save its case
+job_id = st.session_state.pending_job_id
+status = get_job_status(job_id) if job_id else None
+
+if status in ('queued', 'started'):
+    show_generation_progress()
+elif job_id:
+    progress_placeholder = st.empty()
+    st.session_state.pending_job_id = None
+
+    if status == 'unknown':
+        st.warning("⚠️ The mystery being created was lost (the app may have restarted). Please try again!")
+    else:
         try:
-            # Show progress steps
-            progress_placeholder = st.empty()
-            progress_placeholder.info("📝 Step 1/3: Generating mystery story...")
-
-            # Create generation parameters
-            params = CaseGenerationParams(
-                difficulty=difficulty,
-                theme=theme if theme != "random" else "",
-                location=location,
-                era=time_of_day if time_of_day != "random" else "",
-                language=language,
-                custom_scenario=custom_scenario.strip() if custom_scenario else ""
-            )
-
-            # Generate the case with images
-            progress_placeholder.info("🎨 Step 2/3: Creating AI artwork (this may take 1-2 minutes)...")
-            generated_case = generate_case(params, generate_images=True)
-
-            # Convert to dict for storage - structure matches what save_case expects
-            case_dict = {
-                'case': {
-                    'id': generated_case.case.id,
-                    'title': generated_case.case.title,
-                    'description': generated_case.case.description,
-                    'summary': generated_case.case.summary,
-                    'difficulty': generated_case.case.difficulty,
-                    'location': generated_case.case.location,
-                    'solved': False,
-                    'archived': False,
-                    'dateTime': getattr(generated_case.case, 'dateTime', ''),
-                    'imageUrl': generated_case.case.imageUrl,
-                    'isLLMGenerated': True
-                },
-                'clues': [asdict(c) for c in generated_case.clues],
-                'suspects': [asdict(s) for s in generated_case.suspects],
-                'solution': generated_case.solution
-            }
+            # Already converted to the dict save_case expects on the worker
+            case_dict = pop_job_result(job_id)
 
             # Save to database
-            progress_placeholder.info("💾 Step 3/3: Saving to database...")
+            progress_placeholder.progress(0.97, text="💾 Step 3/3: Saving to database...")
             save_case(case_dict)
 
             # Set as active case
@@ -223,6 +203,7 @@ if submitted:
             st.balloons()
 
         except Exception as e:
+            progress_placeholder.empty()
             st.error(f"❌ Failed to generate case: {str(e)}")
             st.info("💡 Make sure your OPENAI_API_KEY is set correctly in your .env file")
             st.exception(e)  # Show full error for debugging
@@ -244,9 +225,9 @@ if st.session_state.just_generated_case:
     url_identifier = f"case/{case_dict['case']['id']}"
     image_data = get_image_data(url_identifier)
     if image_data:
-        data_uri = get_image_data_uri(image_data['data'])
-        st.markdown(f'<img src="{data_uri}" style="width: 100%; max-height: 400px; object-fit: cover;">',
-                   unsafe_allow_html=True)
+        # Raw bytes are served from Streamlit's media endpoint, which the
+        # browser caches, instead of being inlined into every rerun
+        st.image(image_data['data'], use_container_width=True, caption="Case Scene")
     elif case_dict['case'].get('imageUrl') and case_dict['case']['imageUrl'] not in ["/case-file.png", ""]:
         st.image(case_dict['case']['imageUrl'], use_container_width=True, caption="Case Scene")
 
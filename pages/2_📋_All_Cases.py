@@ -1,9 +1,14 @@
 """All Cases Page - Browse and manage your detective cases"""
 
+import math
 import streamlit as st
-from lib.database import get_all_cases, delete_case, update_case_status
+from lib.database import get_all_cases, has_cases, delete_case, update_case_status
+from lib.ui import load_custom_css
 
 
+# Case cards shown per page
+CASES_PER_PAGE = 10
+
 # Page configuration
 st.set_page_config(
     page_title="All Cases - Emerson's Detective Game",
@@ -12,69 +17,90 @@ st.set_page_config(
 )
 
 
-def load_custom_css():
-    """Load custom CSS"""
-    st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Bangers&family=Comic+Neue:wght@400;700&display=swap');
-
-    :root {
-        --primary-color: #FF6B35;
-        --secondary-color: #F7931E;
-        --bg-light: #FFF9F0;
-    }
-
-    .main {
-        background-color: var(--bg-light);
-    }
-
-    .detective-card {
-        background: linear-gradient(135deg, #FFFFFF 0%, #FFF9F0 100%);
-        border: 4px solid var(--primary-color);
-        border-radius: 15px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        box-shadow: 5px 5px 0px var(--secondary-color);
-        color: #2C3E50;
-    }
-
-    .stButton>button {
-        background: linear-gradient(135deg, var(--primary-color) 0%, var(--secondary-color) 100%);
-        color: white;
-        font-family: 'Comic Neue', cursive;
-        font-weight: bold;
-        border: 3px solid #2C3E50;
-        border-radius: 10px;
-        padding: 0.5rem 1.5rem;
-        box-shadow: 3px 3px 0px #2C3E50;
-    }
-
-    /* Sidebar styling for better contrast */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #FFF9F0 0%, #FFE8CC 100%);
-        border-right: 4px solid var(--primary-color);
-    }
-
-    [data-testid="stSidebar"] a,
-    [data-testid="stSidebar"] [data-testid="stPageLink-NavLink"],
-    [data-testid="stSidebar"] [role="link"],
-    [data-testid="stSidebar"] p,
-    [data-testid="stSidebar"] span,
-    [data-testid="stSidebar"] label {
-        color: #2C3E50 !important;
-        font-weight: bold !important;
-    }
-
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    </style>
-    """, unsafe_allow_html=True)
+@st.fragment
+def render_case_card(case: dict, show_archived: bool):
+    """Render one case card; its buttons rerun only this card
+
+    Changes made by the card are remembered in session state, because a
+    fragment rerun is called with the case dict from the last full run.
+
+    Args:
+        case: Case dict from get_all_cases
+        show_archived: Whether archived cases are being listed
+    """
+    card_state = st.session_state.case_card_state.get(case['id'])
+    if card_state == 'deleted':
+        st.caption(f"🗑️ Deleted: {case['title']}")
+        return
+
+    is_archived = card_state == 'archived' if card_state else case.get('archived', False)
+    if is_archived and not show_archived:
+        st.caption(f"📦 Archived: {case['title']}")
+        return
+
+    st.markdown('<div class="detective-card">', unsafe_allow_html=True)
+
+    # Status display
+    if is_archived:
+        status_emoji = "📦"
+        status_text = "ARCHIVED"
+    elif case.get('solved', False):
+        status_emoji = "✅"
+        status_text = "SOLVED"
+    else:
+        status_emoji = "🔍"
+        status_text = "ACTIVE"
+
+    st.markdown(f"### {status_emoji} {case['title']}")
+    st.caption(f"**Status:** {status_text} | **Difficulty:** {case.get('difficulty', 'medium').title()}")
+    st.markdown(f"_{case['description'][:200]}..._")
+
+    # Action buttons
+    col_btn1, col_btn2, col_btn3, col_btn4 = st.columns(4)
+
+    with col_btn1:
+        if st.button("🔍 Investigate", key=f"view_{case['id']}", use_container_width=True):
+            st.session_state.selected_case_id = case['id']
+            st.switch_page("pages/3_🔍_Case_Details.py")
+
+    with col_btn2:
+        if not is_archived:
+            if st.button("📦 Archive", key=f"archive_{case['id']}", use_container_width=True):
+                update_case_status(case['id'], archived=True)
+                st.session_state.case_card_state[case['id']] = 'archived'
+                st.rerun(scope="fragment")
+        else:
+            if st.button("📂 Unarchive", key=f"unarchive_{case['id']}", use_container_width=True):
+                update_case_status(case['id'], archived=False)
+                st.session_state.case_card_state[case['id']] = 'active'
+                st.rerun(scope="fragment")
+
+    with col_btn3:
+        if case.get('solved'):
+            st.success("✅ Solved", icon="✅")
+        else:
+            st.info("🔍 Unsolved")
+
+    with col_btn4:
+        if st.button("🗑️ Delete", key=f"delete_{case['id']}", use_container_width=True):
+            if st.session_state.get(f'confirm_delete_{case["id"]}'):
+                delete_case(case['id'])
+                st.session_state[f'confirm_delete_{case["id"]}'] = False
+                st.session_state.case_card_state[case['id']] = 'deleted'
+                st.rerun(scope="fragment")
+            else:
+                st.session_state[f'confirm_delete_{case["id"]}'] = True
+                st.warning("Click again to confirm deletion")
+
+    st.markdown('</div>', unsafe_allow_html=True)
 
 
 # Load CSS
 load_custom_css()
 
+# A full run reloads every case, so card-level changes are already reflected
+st.session_state.case_card_state = {}
+
 
 # Header
 st.markdown("""
@@ -84,10 +110,7 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-# Load cases from database
-cases = get_all_cases()
-
-if not cases:
+if not has_cases():
     st.markdown("""
     <div class="detective-card" style="text-align: center; padding: 3rem;">
         <h2 style="color: #F7931E; font-family: 'Comic Neue', cursive;">🔍 No cases yet!</h2>
@@ -113,74 +136,24 @@ else:
 
     st.markdown("---")
 
-    # Display cases
-    filtered_count = 0
-    for case in cases:
-        # Filter by archived status
-        is_archived = case.get('archived', False)
-        if not show_archived and is_archived:
-            continue
-
-        # Filter by search
-        if search.lower() and search.lower() not in case['title'].lower() and search.lower() not in case['description'].lower():
-            continue
-
-        filtered_count += 1
-
-        st.markdown('<div class="detective-card">', unsafe_allow_html=True)
-
-        # Status display
-        if is_archived:
-            status_emoji = "📦"
-            status_text = "ARCHIVED"
-        elif case.get('solved', False):
-            status_emoji = "✅"
-            status_text = "SOLVED"
-        else:
-            status_emoji = "🔍"
-            status_text = "ACTIVE"
-
-        st.markdown(f"### {status_emoji} {case['title']}")
-        st.caption(f"**Status:** {status_text} | **Difficulty:** {case.get('difficulty', 'medium').title()}")
-        st.markdown(f"_{case['description'][:200]}..._")
-
-        # Action buttons
-        col_btn1, col_btn2, col_btn3, col_btn4 = st.columns(4)
-
-        with col_btn1:
-            if st.button("🔍 Investigate", key=f"view_{case['id']}", use_container_width=True):
-                st.session_state.selected_case_id = case['id']
-                st.switch_page("pages/3_🔍_Case_Details.py")
-
-        with col_btn2:
-            if not is_archived:
-                if st.button("📦 Archive", key=f"archive_{case['id']}", use_container_width=True):
-                    update_case_status(case['id'], archived=True)
-                    st.rerun()
-            else:
-                if st.button("📂 Unarchive", key=f"unarchive_{case['id']}", use_container_width=True):
-                    update_case_status(case['id'], archived=False)
-                    st.rerun()
+    # Load the matching cases; the database does the filtering
+    cases = get_all_cases(search=search.strip(), include_archived=show_archived)
 
-        with col_btn3:
-            if case.get('solved'):
-                st.success("✅ Solved", icon="✅")
-            else:
-                st.info("🔍 Unsolved")
-
-        with col_btn4:
-            if st.button("🗑️ Delete", key=f"delete_{case['id']}", use_container_width=True):
-                if st.session_state.get(f'confirm_delete_{case["id"]}'):
-                    delete_case(case['id'])
-                    st.session_state[f'confirm_delete_{case["id"]}'] = False
-                    st.rerun()
-                else:
-                    st.session_state[f'confirm_delete_{case["id"]}'] = True
-                    st.warning("Click again to confirm deletion")
+    # Paginate so only one page of cards is rendered per run
+    page_count = max(1, math.ceil(len(cases) / CASES_PER_PAGE))
+    if st.session_state.get('cases_page', 1) > page_count:
+        st.session_state.cases_page = page_count
+    if page_count > 1:
+        page = st.number_input("Page", min_value=1, max_value=page_count, key='cases_page')
+    else:
+        page = 1
 
-        st.markdown('</div>', unsafe_allow_html=True)
+    # Display cases
+    start = (page - 1) * CASES_PER_PAGE
+    for case in cases[start:start + CASES_PER_PAGE]:
+        render_case_card(case, show_archived)
 
-    if filtered_count == 0:
+    if not cases:
         st.info("No cases match your search criteria.")
 
 # Navigation
@@ -3,7 +3,7 @@
 import streamlit as st
 import html
 from lib.clue_analyzer import analyze_clue
-from lib.suspect_analyzer import analyze_suspect, process_interview_question
+from lib.suspect_analyzer import analyze_suspect, stream_interview_answer
 from lib.case_solver import analyze_solution
 from lib.types import Clue, Suspect, Case
 from lib.database import (
@@ -12,15 +12,15 @@ from lib.database import (
     get_interviewed_suspects,
     mark_clue_examined,
     mark_suspect_interviewed,
-    save_clue_analysis,
     get_clue_analysis,
     save_interview,
     get_suspect_interviews,
     update_case_status,
     get_image_data
 )
-from lib.image_generator import get_image_data_uri
+from lib.image_generator import get_image_thumbnail
 from lib.sample_questions import get_sample_questions_for_suspect
+from lib.ui import load_custom_css
 from lib.audio_utils import (
     get_tts_component,
     get_speech_recognition_component,
@@ -28,7 +28,6 @@ from lib.audio_utils import (
     get_audio_settings_ui,
     play_celebration_sound
 )
-from dataclasses import asdict
 
 
 # Page configuration
@@ -39,44 +38,8 @@ st.set_page_config(
 )
 
 
-def load_custom_css():
-    """Load the custom CSS (same as main app)"""
-    st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Bangers&family=Comic+Neue:wght@400;700&display=swap');
-
-    :root {
-        --primary-color: #FF6B35;
-        --secondary-color: #F7931E;
-        --accent-color: #FDC830;
-        --bg-light: #FFF9F0;
-    }
-
-    .main {
-        background-color: var(--bg-light);
-    }
-
-    .detective-card {
-        background: linear-gradient(135deg, #FFFFFF 0%, #FFF9F0 100%);
-        border: 4px solid var(--primary-color);
-        border-radius: 15px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        box-shadow: 5px 5px 0px var(--secondary-color);
-        color: #2C3E50;
-    }
-
-    .stButton>button {
-        background: linear-gradient(135deg, var(--primary-color) 0%, var(--secondary-color) 100%);
-        color: white;
-        font-family: 'Comic Neue', cursive;
-        font-weight: bold;
-        border: 3px solid #2C3E50;
-        border-radius: 10px;
-        padding: 0.5rem 1.5rem;
-        box-shadow: 3px 3px 0px #2C3E50;
-    }
-
+# Page-specific rules added to the shared styles
+PAGE_CSS = """
     .sample-question-btn {
         background-color: #FFF9F0;
         border: 2px solid var(--secondary-color);
@@ -114,22 +77,6 @@ def load_custom_css():
         box-shadow: none !important;
     }
 
-    /* Sidebar styling for better contrast */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #FFF9F0 0%, #FFE8CC 100%);
-        border-right: 4px solid var(--primary-color);
-    }
-
-    [data-testid="stSidebar"] a,
-    [data-testid="stSidebar"] [data-testid="stPageLink-NavLink"],
-    [data-testid="stSidebar"] [role="link"],
-    [data-testid="stSidebar"] p,
-    [data-testid="stSidebar"] span,
-    [data-testid="stSidebar"] label {
-        color: #2C3E50 !important;
-        font-weight: bold !important;
-    }
-
     .chat-message {
         padding: 1rem;
         border-radius: 10px;
@@ -149,16 +96,11 @@ def load_custom_css():
         border-left: 4px solid #8BC34A;
         color: #2E7D32;
     }
-
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    </style>
-    """, unsafe_allow_html=True)
+"""
 
 
 # Load custom CSS
-load_custom_css()
+load_custom_css(PAGE_CSS)
 
 
 # Get selected case from database
@@ -206,9 +148,9 @@ with st.expander("📖 Case Description", expanded=True):
     url_identifier = f"case/{case_id}"
     image_data = get_image_data(url_identifier)
     if image_data:
-        data_uri = get_image_data_uri(image_data['data'])
-        st.markdown(f'<img src="{data_uri}" style="width: 100%; max-height: 400px; object-fit: cover;">',
-                   unsafe_allow_html=True)
+        # Raw bytes are served from Streamlit's media endpoint, which the
+        # browser caches, instead of being inlined into every rerun
+        st.image(image_data['data'], use_container_width=True)
     elif case.get('imageUrl') and case['imageUrl'] not in ["/case-file.png", ""]:
         st.image(case['imageUrl'], use_container_width=True)
 
@@ -254,14 +196,14 @@ with tab1:
 
                 # Layout with image if available
                 url_identifier = f"clue/{clue_dict['id']}"
-                image_data = get_image_data(url_identifier)
+                image_data = get_image_thumbnail(url_identifier)
                 if image_data or clue_dict.get('imageUrl'):
                     col_img, col_content = st.columns([1, 2])
                     with col_img:
                         if image_data:
-                            data_uri = get_image_data_uri(image_data['data'])
-                            st.markdown(f'<img src="{data_uri}" style="width: 100%;">',
-                                       unsafe_allow_html=True)
+                            # Raw bytes are served from Streamlit's media endpoint as a
+                            # separate, cacheable request instead of an inline data URI
+                            st.image(image_data, use_container_width=True)
                         elif clue_dict.get('imageUrl'):
                             st.image(clue_dict['imageUrl'], use_container_width=True)
 
@@ -304,34 +246,19 @@ with tab1:
                         with st.spinner("🔬 Analyzing clue..."):
                             try:
                                 # Convert to objects
-                                clue_obj = Clue(**clue_dict)
-                                case_obj = Case(
-                                    id=case['id'],
-                                    title=case['title'],
-                                    description=case['description'],
-                                    summary=case.get('summary', ''),
-                                    location=case.get('location', ''),
-                                    difficulty=case.get('difficulty', 'medium')
-                                )
-                                suspects = [Suspect(**s) for s in case['suspects']]
-                                discovered_clues = [Clue(**c) for c in case['clues']]
+                                clue_obj = Clue.from_dict(clue_dict)
+                                case_obj = Case.from_dict(case)
+                                suspects = [Suspect.from_dict(s) for s in case['suspects']]
+                                discovered_clues = [Clue.from_dict(c) for c in case['clues']]
 
-                                # Analyze clue with AI
-                                analysis = analyze_clue(
+                                # Analyze clue with AI (the analyzer stores the result)
+                                analyze_clue(
                                     clue_obj,
                                     suspects,
                                     case_obj,
                                     discovered_clues,
                                     st.session_state.get('language', 'en')
                                 )
-
-                                # Save to database
-                                analysis_dict = {
-                                    'summary': analysis.summary,
-                                    'connections': [asdict(c) for c in analysis.connections],
-                                    'nextSteps': analysis.nextSteps
-                                }
-                                save_clue_analysis(clue_dict['id'], case_id, analysis_dict)
                                 mark_clue_examined(clue_dict['id'])
 
                                 # Play sound effect
@@ -359,14 +286,14 @@ with tab2:
 
                 # Layout with portrait if available
                 url_identifier = f"suspect/{suspect_dict['id']}"
-                image_data = get_image_data(url_identifier)
+                image_data = get_image_thumbnail(url_identifier)
                 if image_data or suspect_dict.get('imageUrl'):
                     col_img, col_content = st.columns([1, 2])
                     with col_img:
                         if image_data:
-                            data_uri = get_image_data_uri(image_data['data'])
-                            st.markdown(f'<img src="{data_uri}" style="width: 100%;">',
-                                       unsafe_allow_html=True)
+                            # Raw bytes are served from Streamlit's media endpoint as a
+                            # separate, cacheable request instead of an inline data URI
+                            st.image(image_data, use_container_width=True)
                         elif suspect_dict.get('imageUrl'):
                             st.image(suspect_dict['imageUrl'], use_container_width=True)
 
@@ -467,16 +394,9 @@ with tab2:
                             if question:
                                 with st.spinner(f"💭 {suspect_dict['name']} is thinking..."):
                                     try:
-                                        suspect_obj = Suspect(**suspect_dict)
-                                        case_obj = Case(
-                                            id=case['id'],
-                                            title=case['title'],
-                                            description=case['description'],
-                                            summary=case.get('summary', ''),
-                                            location=case.get('location', ''),
-                                            difficulty=case.get('difficulty', 'medium')
-                                        )
-                                        clues = [Clue(**c) for c in case['clues']]
+                                        suspect_obj = Suspect.from_dict(suspect_dict)
+                                        case_obj = Case.from_dict(case)
+                                        clues = [Clue.from_dict(c) for c in case['clues']]
 
                                         # Get previous questions for context
                                         previous_qa = [
@@ -484,15 +404,15 @@ with tab2:
                                             for qa in interview_history
                                         ]
 
-                                        # Process question with AI
-                                        answer = process_interview_question(
+                                        # Show the answer as the AI writes it
+                                        answer = st.write_stream(stream_interview_answer(
                                             question,
                                             suspect_obj,
                                             clues,
                                             case_obj,
                                             previous_qa,
                                             st.session_state.get('language', 'en')
-                                        )
+                                        ))
 
                                         # Save to database
                                         save_interview(suspect_dict['id'], case_id, question, answer)
@@ -578,16 +498,9 @@ with tab3:
         else:
             with st.spinner("🔍 Detective reviewing your solution..."):
                 try:
-                    case_obj = Case(
-                        id=case['id'],
-                        title=case['title'],
-                        description=case['description'],
-                        summary=case.get('summary', ''),
-                        location=case.get('location', ''),
-                        difficulty=case.get('difficulty', 'medium')
-                    )
-                    suspects = [Suspect(**s) for s in case['suspects']]
-                    clues = [Clue(**c) for c in case['clues']]
+                    case_obj = Case.from_dict(case)
+                    suspects = [Suspect.from_dict(s) for s in case['suspects']]
+                    clues = [Clue.from_dict(c) for c in case['clues']]
 
                     # Analyze solution with AI
                     solution = analyze_solution(
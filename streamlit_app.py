@@ -457,9 +457,9 @@ def show_home_page():
 
                 # Show progress
                 examined = len(get_examined_clues(active_case['id']))
-                total_clues = len(active_case.get('clues', []))
+                total_clues = active_case['num_clues']
                 interviewed = len(get_interviewed_suspects(active_case['id']))
-                total_suspects = len(active_case.get('suspects', []))
+                total_suspects = active_case['num_suspects']
 
                 col_a, col_b = st.columns(2)
                 with col_a: